@@ -0,0 +1,325 @@
+"""Capacity-aware placement of frame blasting flows on ByteBlower ports."""
+import logging
+from typing import (  # for type hinting
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from byteblower_test_framework.traffic import (  # Frame overhead
+    ETHERNET_FCS_LENGTH,
+    ETHERNET_PHYSICAL_OVERHEAD,
+    VLAN_HEADER_LENGTH,
+)
+
+# Traffic direction on a link
+TX = 'TX'
+RX = 'RX'
+
+
+class Interface(NamedTuple):
+    """ByteBlower interface on a ByteBlower server."""
+
+    #: Host name or IP address of the ByteBlower server
+    server: str
+    #: Name of the ByteBlower interface, for example ``trunk-1-5``
+    name: str
+
+    @property
+    def physical_interface(self) -> str:
+        """Return the name of the physical interface.
+
+        All ByteBlower interfaces on a trunk (``trunk-1-1``,
+        ``trunk-1-2``, ...) share the physical interface (``trunk-1``).
+        """
+        if self.name.startswith('trunk-'):
+            return self.name.rsplit('-', 1)[0]
+        return self.name
+
+
+def line_rate(frame_size: int, frame_rate: float, vlan_tags: int = 0) -> float:
+    """Return the bitrate of a flow on the wire.
+
+    The line rate includes the Ethernet FCS, the VLAN tags and the
+    physical overhead (preamble, start frame delimiter and inter-frame
+    gap) of every frame.
+
+    :param frame_size: Frame size, as used in the ByteBlower Test
+       Framework: *excluding* Ethernet FCS and *excluding* VLAN tags
+    :type frame_size: int
+    :param frame_rate: Rate at which the frames are transmitted
+       (in frames per second)
+    :type frame_rate: float
+    :param vlan_tags: Number of VLAN tags, defaults to 0
+    :type vlan_tags: int, optional
+    :return: Line rate (in bits per second)
+    :rtype: float
+    """
+    return 8 * frame_rate * (
+        frame_size + vlan_tags * VLAN_HEADER_LENGTH + ETHERNET_FCS_LENGTH +
+        ETHERNET_PHYSICAL_OVERHEAD
+    )
+
+
+class FlowDemand(NamedTuple):
+    """Traffic of a flow which must be placed on ByteBlower interfaces."""
+
+    #: Name of the flow
+    name: str
+    #: Frame size, *excluding* Ethernet FCS and *excluding* VLAN tags
+    frame_size: int
+    #: Frame rate (in frames per second)
+    frame_rate: float
+    #: Interfaces which can send the traffic of the flow
+    sources: Sequence[Interface]
+    #: Interfaces which can receive the traffic of the flow
+    destinations: Sequence[Interface]
+    #: Number of VLAN tags on the frames of the flow
+    vlan_tags: int = 0
+
+    @property
+    def line_rate(self) -> float:
+        """Return the bitrate of the flow on the wire."""
+        return line_rate(self.frame_size, self.frame_rate, self.vlan_tags)
+
+
+class Placement(NamedTuple):
+    """Interfaces where a flow is placed on."""
+
+    flow: FlowDemand
+    source: Interface
+    destination: Interface
+
+
+class LinkLoad(NamedTuple):
+    """Planned traffic in one direction of a (physical) interface."""
+
+    #: Host name or IP address of the ByteBlower server
+    server: str
+    #: Name of the ByteBlower interface or physical interface
+    name: str
+    #: Traffic direction, :const:`TX` or :const:`RX`
+    direction: str
+    #: Planned line rate (in bits per second)
+    load: float
+    #: Line rate of the link (in bits per second)
+    capacity: float
+    #: Names of the flows using the link
+    flows: Tuple[str, ...]
+
+    @property
+    def utilisation(self) -> float:
+        """Return the planned load relative to the capacity."""
+        return self.load / self.capacity
+
+
+class CapacityPlan(object):
+    """Placement of flows and the resulting load of all links."""
+
+    __slots__ = (
+        '_placements',
+        '_links',
+        '_maximum_utilisation',
+    )
+
+    def __init__(
+        self,
+        placements: Sequence[Placement],
+        links: Sequence[LinkLoad],
+        maximum_utilisation: float,
+    ) -> None:
+        self._placements = {
+            placement.flow.name: placement
+            for placement in placements
+        }
+        self._links = links
+        self._maximum_utilisation = maximum_utilisation
+
+    @property
+    def placements(self) -> Dict[str, Placement]:
+        """Return the placement of each flow, by flow name."""
+        return self._placements
+
+    @property
+    def links(self) -> Sequence[LinkLoad]:
+        """Return the planned load of all links."""
+        return self._links
+
+    @property
+    def oversubscriptions(self) -> List[LinkLoad]:
+        """Return the links with more load than allowed."""
+        return [
+            link for link in self._links
+            if link.utilisation > self._maximum_utilisation
+        ]
+
+    def warn(self) -> bool:
+        """Log a warning for each oversubscribed link.
+
+        :return: Whether any link is oversubscribed
+        :rtype: bool
+        """
+        oversubscriptions = self.oversubscriptions
+        for link in oversubscriptions:
+            logging.warning(
+                'Oversubscribed %s %s (%s): %.1f Mbps of %.1f Mbps'
+                ' (%.1f%%) by %d flow(s)',
+                link.server,
+                link.name,
+                link.direction,
+                link.load / 1e6,
+                link.capacity / 1e6,
+                100 * link.utilisation,
+                len(link.flows),
+            )
+        return bool(oversubscriptions)
+
+
+class CapacityPlanner(object):
+    """Place flows on ByteBlower interfaces without exceeding capacity.
+
+    The planner knows the line rate of each ByteBlower interface and of
+    the physical interfaces which are shared by trunk interfaces. Every
+    link is full-duplex: transmitted and received traffic are counted
+    separately.
+
+    The flows are placed from the highest to the lowest line rate.
+    Each flow is placed on the source and destination interface which
+    keep the highest utilisation of the affected links as low as
+    possible. This spreads the traffic over all candidate interfaces.
+    """
+
+    __slots__ = (
+        '_capacities',
+        '_maximum_utilisation',
+    )
+
+    def __init__(self, maximum_utilisation: float = 1.0) -> None:
+        """Create a capacity planner.
+
+        :param maximum_utilisation: Highest allowed load of a link,
+           relative to its line rate, defaults to 1.0
+        :type maximum_utilisation: float, optional
+        """
+        self._capacities: Dict[Tuple[str, str], float] = {}
+        self._maximum_utilisation = maximum_utilisation
+
+    def add_interface(
+        self,
+        interface: Interface,
+        interface_line_rate: float,
+        physical_line_rate: Optional[float] = None,
+    ) -> None:
+        """Add the line rate of a ByteBlower interface.
+
+        :param interface: ByteBlower interface
+        :type interface: Interface
+        :param interface_line_rate: Line rate of the interface
+           (in bits per second)
+        :type interface_line_rate: float
+        :param physical_line_rate: Line rate of the physical interface,
+           shared with the other interfaces on the same trunk
+           (in bits per second), defaults to ``None`` (no shared limit)
+        :type physical_line_rate: Optional[float], optional
+        """
+        self._capacities[interface] = interface_line_rate
+        if (physical_line_rate is not None
+                and interface.physical_interface != interface.name):
+            physical_interface = (
+                interface.server, interface.physical_interface
+            )
+            self._capacities[physical_interface] = physical_line_rate
+
+    def plan(self, demands: Iterable[FlowDemand]) -> CapacityPlan:
+        """Place the flows on the ByteBlower interfaces.
+
+        When a flow does not fit on any of its candidate interfaces,
+        it is placed where the oversubscription is the lowest.
+        See :attr:`CapacityPlan.oversubscriptions`.
+
+        :param demands: Traffic of the flows
+        :type demands: Iterable[FlowDemand]
+        :raises ValueError: When the line rate of a candidate interface
+           is unknown or when a flow has no candidate interfaces
+        :return: Placement of the flows and the load of all links
+        :rtype: CapacityPlan
+        """
+        loads: Dict[Tuple[str, str, str], float] = {}
+        flows: Dict[Tuple[str, str, str], List[str]] = {}
+        placements: List[Placement] = []
+        for demand in sorted(demands, key=lambda demand: demand.line_rate,
+                             reverse=True):
+            if not demand.sources or not demand.destinations:
+                raise ValueError(
+                    f'Flow {demand.name!r} has no candidate interfaces'
+                )
+            for interface in (*demand.sources, *demand.destinations):
+                if interface not in self._capacities:
+                    raise ValueError(
+                        f'Unknown line rate of interface {interface.name!r}'
+                        f' on {interface.server!r}'
+                    )
+            source, destination = self._place(loads, demand)
+            for link in self._links(source, destination):
+                loads[link] = loads.get(link, 0.0) + demand.line_rate
+                flows.setdefault(link, []).append(demand.name)
+            placements.append(Placement(demand, source, destination))
+
+        links = [
+            LinkLoad(
+                server,
+                name,
+                direction,
+                load,
+                self._capacities[(server, name)],
+                tuple(flows[(server, name, direction)]),
+            ) for (server, name, direction), load in loads.items()
+        ]
+        return CapacityPlan(placements, links, self._maximum_utilisation)
+
+    def _links(self, source: Interface,
+               destination: Interface) -> List[Tuple[str, str, str]]:
+        """Return the links which carry the traffic of a flow."""
+        links = []
+        for interface, direction in ((source, TX), (destination, RX)):
+            links.append((interface.server, interface.name, direction))
+            physical_link = (interface.server, interface.physical_interface)
+            if (interface.physical_interface != interface.name
+                    and physical_link in self._capacities):
+                links.append((*physical_link, direction))
+        return links
+
+    def _place(
+        self,
+        loads: Dict[Tuple[str, str, str], float],
+        demand: FlowDemand,
+    ) -> Tuple[Interface, Interface]:
+        """Return the interfaces with the lowest utilisation for a flow."""
+        candidates = [
+            (source, destination)
+            for source in demand.sources
+            for destination in demand.destinations
+        ]
+        utilisations = [
+            self._utilisation(loads, demand.line_rate, source, destination)
+            for source, destination in candidates
+        ]
+        return candidates[utilisations.index(min(utilisations))]
+
+    def _utilisation(
+        self,
+        loads: Dict[Tuple[str, str, str], float],
+        flow_line_rate: float,
+        source: Interface,
+        destination: Interface,
+    ) -> float:
+        """Return the highest utilisation when placing a flow."""
+        return max(
+            (loads.get(link, 0.0) + flow_line_rate) /
+            self._capacities[link[:2]]
+            for link in self._links(source, destination)
+        )
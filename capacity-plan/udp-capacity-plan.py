@@ -0,0 +1,223 @@
+"""UDP test with capacity-aware placement of the flows on the ports."""
+import logging  # Use the Python default logging interface
+import sys
+from datetime import timedelta
+from os import getcwd
+from os.path import join
+from typing import Dict, List  # for type hinting
+
+from byteblower_test_framework.analysis import \
+    LatencyFrameLossAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    IPv4Port,
+    NatDiscoveryIPv4Port,
+    Port,
+)
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+from byteblower_test_framework.report import (  # Reporting
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+    ByteBlowerUnitTestReport,
+)
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import (  # Traffic generation
+    FrameBlastingFlow,
+    IPv4Frame,
+)
+
+from capacity_plan import (  # Capacity-aware flow placement
+    CapacityPlanner,
+    FlowDemand,
+    Interface,
+)
+
+# ByteBlower Server connection parameters
+_SERVER = 'byteblower-tutorial-3100.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'nontrunk-1'
+_CPE_INTERFACES = [f'trunk-1-{number}' for number in range(1, 9)]
+
+# Line rates of the ByteBlower interfaces (in bits per second)
+_WAN_LINE_RATE = 10e9
+_CPE_LINE_RATE = 1e9
+# All CPE interfaces share the physical interface of the trunk
+_TRUNK_LINE_RATE = 10e9
+
+# Keep 5% headroom on every link
+_MAXIMUM_UTILISATION = 0.95
+
+# ByteBlower Port Layer 3 addressing parameters
+# Manual IPv4 configuration:
+_WAN_IPv4 = '10.8.128.61'
+_WAN_NETMASK = '255.255.255.0'
+_WAN_GATEWAY = '10.8.128.1'
+
+_CPE_IPv4 = 'dhcp'
+
+# Traffic parameters: frame size (excluding FCS) and frame rate
+_DOWNSTREAM_TRAFFIC = [(1514, 20000)] * 8 + [(64, 100000)] * 16
+_UPSTREAM_TRAFFIC = [(512, 10000)] * 16
+_DURATION = timedelta(seconds=10)
+
+# The generated reports will be stored to the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+
+def main() -> int:
+    """Run the main test procedure.
+
+    :return: Exit code: 1 when the ports would be oversubscribed
+    :rtype: int
+    """
+    # 1. Place the flows on the ByteBlower interfaces
+
+    wan_interface = Interface(_SERVER, _WAN_INTERFACE)
+    cpe_interfaces = [Interface(_SERVER, name) for name in _CPE_INTERFACES]
+
+    planner = CapacityPlanner(maximum_utilisation=_MAXIMUM_UTILISATION)
+    planner.add_interface(wan_interface, _WAN_LINE_RATE)
+    for cpe_interface in cpe_interfaces:
+        planner.add_interface(
+            cpe_interface,
+            _CPE_LINE_RATE,
+            physical_line_rate=_TRUNK_LINE_RATE,
+        )
+
+    demands: List[FlowDemand] = []
+    for number, (frame_size, frame_rate) in enumerate(_DOWNSTREAM_TRAFFIC,
+                                                      start=1):
+        demands.append(
+            FlowDemand(
+                f'Downstream UDP flow {number}',
+                frame_size,
+                frame_rate,
+                sources=[wan_interface],
+                destinations=cpe_interfaces,
+            )
+        )
+    for number, (frame_size, frame_rate) in enumerate(_UPSTREAM_TRAFFIC,
+                                                      start=1):
+        demands.append(
+            FlowDemand(
+                f'Upstream UDP flow {number}',
+                frame_size,
+                frame_rate,
+                sources=cpe_interfaces,
+                destinations=[wan_interface],
+            )
+        )
+
+    plan = planner.plan(demands)
+    for link in sorted(plan.links):
+        logging.info(
+            'Planned %s (%s): %.1f Mbps (%.1f%%) by %d flow(s)',
+            link.name,
+            link.direction,
+            link.load / 1e6,
+            100 * link.utilisation,
+            len(link.flows),
+        )
+    # Stop before any traffic is sent
+    if plan.warn():
+        logging.error('Ports are oversubscribed. Not running the test.')
+        return 1
+
+    # 2. Create a new Scenario
+    scenario = Scenario()
+
+    # Generate a HTML report
+    byteblower_html_report = ByteBlowerHtmlReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_html_report)
+    # Generate a JUnit XML report
+    byteblower_unittest_report = ByteBlowerUnitTestReport(
+        output_dir=_REPORT_PATH
+    )
+    scenario.add_report(byteblower_unittest_report)
+    # Generate a JSON summary report
+    byteblower_summary_report = ByteBlowerJsonReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_summary_report)
+
+    # 3. Connect to the ByteBlower server and create & initialize ports
+
+    # Connect to the ByteBlower Server
+    server = Server(_SERVER)
+    logging.info('Connected to ByteBlower Server %s', server.info)
+
+    # Simulate a host at the WAN-side of the network
+    wan_port = IPv4Port(
+        server,
+        interface=_WAN_INTERFACE,
+        ipv4=_WAN_IPv4,
+        netmask=_WAN_NETMASK,
+        gateway=_WAN_GATEWAY,
+        name='WAN',
+    )
+    ports: Dict[Interface, Port] = {wan_interface: wan_port}
+
+    # Simulate a host at the CPE-side of the network
+    # for each CPE interface which has flows placed on it.
+    for placement in plan.placements.values():
+        for interface in (placement.source, placement.destination):
+            if interface in ports:
+                continue
+            ports[interface] = NatDiscoveryIPv4Port(
+                server,
+                interface=interface.name,
+                ipv4=_CPE_IPv4,
+                name=f'CPE {interface.name}',
+            )
+
+    for port in ports.values():
+        logging.info(
+            'Initialized port %r'
+            ' with IP address %r, network %r',
+            port.name,
+            port.ip,
+            port.network,
+        )
+
+    # 4. Define the traffic test (traffic pattern flows)
+
+    for name, placement in plan.placements.items():
+        frame = IPv4Frame(length=placement.flow.frame_size, latency_tag=True)
+        flow = FrameBlastingFlow(
+            ports[placement.source],
+            ports[placement.destination],
+            name=name,
+            frame_rate=placement.flow.frame_rate,
+            duration=_DURATION,
+            frame_list=[frame],
+        )
+
+        # Analyze frame loss and latency over time
+        flow.add_analyser(LatencyFrameLossAnalyser())
+
+        scenario.add_flow(flow)
+        logging.info('Created %s', flow)
+
+    # 5. Run the traffic test
+
+    # Run the scenario (for 12 seconds)
+    # The flows will stop after 10s, leaving some additional time for
+    # processing the last (delayed?) incoming packets.
+    logging.info('Start scenario')
+    scenario.run(maximum_run_time=timedelta(seconds=12))
+
+    # 6. Generate test report
+
+    logging.info('Generating report')
+    scenario.report()
+    return 0
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""UDP test for a fleet of ByteBlower Endpoints on a single Meeting Point."""
+import logging  # Use the Python default logging interface
+from datetime import timedelta
+from os import getcwd
+from os.path import join
+from time import perf_counter, sleep
+from typing import List, Optional, Sequence  # for type hinting
+
+from byteblower_test_framework.analysis import \
+    LatencyFrameLossAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    IPv4Endpoint,
+    IPv4Port,
+)
+from byteblower_test_framework.factory import create_frame
+from byteblower_test_framework.host import MeetingPoint  # Host interfaces
+from byteblower_test_framework.host import Server
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+from byteblower_test_framework.report import (  # Reporting
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+    ByteBlowerUnitTestReport,
+)
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import \
+    FrameBlastingFlow  # Traffic generation
+from byteblowerll.byteblower import (  # Low-level API
+    ByteBlowerAPIException,
+    DeviceStatus,
+)
+
+# ByteBlower Server connection parameters
+_SERVER = 'byteblower-integration-3100-1.lab.byteblower.excentis.com.'
+
+# ByteBlower Meeting Point connection parameters
+_MEETING_POINT = 'byteblower-integration-3100-1.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'trunk-1-23'
+
+# DHCP IPv4 Configuration
+_WAN_IPv4 = 'dhcp'
+
+# ByteBlower Endpoint selection parameters
+# Unique Identifiers (UUID) of the ByteBlower Endpoint applications.
+# When not given, the available endpoints are discovered
+# on the Meeting Point.
+_UUIDS: Optional[Sequence[str]] = None
+# Only select discovered endpoints of which the (given) device name
+# starts with this prefix. Select all available endpoints when not given.
+_DEVICE_NAME_PREFIX: Optional[str] = None
+# Maximum number of endpoints to use in the test
+_MAXIMUM_ENDPOINTS = 300
+
+# Traffic parameters (per endpoint, for each direction)
+_FRAME_RATE = 100  # frames per second
+_DURATION = timedelta(seconds=10)
+
+# ByteBlower Endpoints only exchange their status and results with the
+# Meeting Point at every heartbeat. Leave them enough time to report their
+# final results after the traffic finished.
+_WAIT_FOR_FINISH = timedelta(seconds=10)
+
+# Retry policy for the scenario run.
+# An endpoint which missed a heartbeat can be temporarily unavailable,
+# which fails the collection of its results via the Meeting Point.
+_RETRY_ATTEMPTS = 3
+_RETRY_INITIAL_DELAY = timedelta(seconds=5)  # doubled on every retry
+
+# The generated reports will be stored to the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+
+def discover_endpoints(
+    meeting_point: MeetingPoint,
+    device_name_prefix: Optional[str] = None,
+    maximum_endpoints: Optional[int] = None,
+) -> List[str]:
+    """Return the UUIDs of the available endpoints on the Meeting Point.
+
+    The list of registered devices is requested only once from the
+    Meeting Point, which avoids a request for every single device.
+
+    :param meeting_point: Meeting Point the endpoints are registered on
+    :type meeting_point: MeetingPoint
+    :param device_name_prefix: Only select endpoints of which the device
+       name starts with this prefix, defaults to ``None``
+    :type device_name_prefix: Optional[str], optional
+    :param maximum_endpoints: Maximum number of endpoints to select,
+       defaults to ``None`` (no limit)
+    :type maximum_endpoints: Optional[int], optional
+    :return: UUIDs of the selected endpoints
+    :rtype: List[str]
+    """
+    uuids: List[str] = []
+    for bb_endpoint in meeting_point.bb_meeting_point.DeviceListGet():
+        if bb_endpoint.StatusGet() != DeviceStatus.Available:
+            # Skip endpoints which are in use or not available
+            continue
+        if device_name_prefix is not None:
+            device_name: str = bb_endpoint.DeviceInfoGet().GivenNameGet()
+            if not device_name.startswith(device_name_prefix):
+                continue
+        uuids.append(bb_endpoint.DeviceIdentifierGet())
+        if maximum_endpoints is not None and len(uuids) >= maximum_endpoints:
+            break
+    return uuids
+
+
+def create_endpoint(
+    meeting_point: MeetingPoint,
+    uuid: str,
+) -> Optional[IPv4Endpoint]:
+    """Create an endpoint.
+
+    :param meeting_point: Meeting Point the endpoint is registered on
+    :type meeting_point: MeetingPoint
+    :param uuid: Unique identifier of the device
+    :type uuid: str
+    :return: The endpoint, ``None`` when it is not available
+    :rtype: Optional[IPv4Endpoint]
+    """
+    try:
+        return IPv4Endpoint(meeting_point, uuid)
+    except ByteBlowerAPIException as error:
+        logging.warning('Skipping endpoint %r: %s', uuid, error)
+        return None
+
+
+def add_endpoint_flows(
+    scenario: Scenario,
+    wan_port: IPv4Port,
+    endpoint: IPv4Endpoint,
+) -> None:
+    """Add the downstream and upstream UDP flow for a single endpoint.
+
+    This is the template for the traffic of every endpoint in the fleet.
+    """
+    number_of_frames = int(_FRAME_RATE * _DURATION.total_seconds())
+    for direction, source, destination in (
+        ('Downstream', wan_port, endpoint),
+        ('Upstream', endpoint, wan_port),
+    ):
+        # Create a UDP frame
+        # Enable the "latency tagging" so we can analyze latency
+        frame = create_frame(source, latency_tag=True)
+        flow = FrameBlastingFlow(
+            source,
+            destination,
+            name=f'{direction} UDP flow {endpoint.name}',
+            frame_rate=_FRAME_RATE,
+            number_of_frames=number_of_frames,
+            frame_list=[frame],
+        )
+
+        # Analyze frame loss and latency over time
+        flow.add_analyser(LatencyFrameLossAnalyser())
+
+        scenario.add_flow(flow)
+
+
+def create_scenario(
+    wan_port: IPv4Port,
+    endpoints: Sequence[IPv4Endpoint],
+) -> Scenario:
+    """Create the scenario with its reports and the flows of all endpoints.
+
+    Every call creates new flows and analysers, so a scenario can be run
+    again from scratch.
+    """
+    scenario = Scenario()
+
+    # Generate a HTML report
+    byteblower_html_report = ByteBlowerHtmlReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_html_report)
+    # Generate a JUnit XML report
+    byteblower_unittest_report = ByteBlowerUnitTestReport(
+        output_dir=_REPORT_PATH
+    )
+    scenario.add_report(byteblower_unittest_report)
+    # Generate a JSON report
+    byteblower_json_report = ByteBlowerJsonReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_json_report)
+
+    # Add the downstream and upstream UDP flow for every endpoint
+    for endpoint in endpoints:
+        add_endpoint_flows(scenario, wan_port, endpoint)
+    return scenario
+
+
+def run_scenario(
+    wan_port: IPv4Port,
+    endpoints: Sequence[IPv4Endpoint],
+) -> Scenario:
+    """Run the test, retry with a new scenario when the run fails.
+
+    When the results of a flow can not be collected via the Meeting Point,
+    the scenario run fails. The resources of the scenario are released and
+    the test runs again with new flows and analysers, after an exponential
+    backoff (:const:`_RETRY_ATTEMPTS` and :const:`_RETRY_INITIAL_DELAY`).
+
+    :param wan_port: Port at the WAN-side of the network
+    :type wan_port: IPv4Port
+    :param endpoints: Endpoints at the CPE-side of the network
+    :type endpoints: Sequence[IPv4Endpoint]
+    :raises ByteBlowerAPIException: When the last attempt fails
+    :return: The scenario which ran successfully
+    :rtype: Scenario
+    """
+    delay = _RETRY_INITIAL_DELAY
+    attempt = 1
+    while True:
+        flow_start = perf_counter()
+        scenario = create_scenario(wan_port, endpoints)
+        logging.info(
+            'Created %d flow(s) in %.1f s',
+            len(scenario.flows),
+            perf_counter() - flow_start,
+        )
+
+        # Run the scenario
+        # All endpoints are prepared and started together by the scenario.
+        # The scenario will run for the configured duration, and then waits
+        # for the endpoints to report their final results to the
+        # Meeting Point.
+        logging.info('Start scenario (attempt %d)', attempt)
+        run_start = perf_counter()
+        try:
+            scenario.run(wait_for_finish=_WAIT_FOR_FINISH)
+            break
+        except ByteBlowerAPIException as error:
+            scenario.release()
+            if attempt >= _RETRY_ATTEMPTS:
+                raise
+            logging.warning(
+                'Scenario failed: %s. Retrying in %.0f s',
+                error,
+                delay.total_seconds(),
+            )
+            sleep(delay.total_seconds())
+            delay *= 2
+            attempt += 1
+    run_duration = perf_counter() - run_start
+
+    # The scenario starts right before the flows are prepared and
+    # ends right after the results are collected and analysed.
+    # The remaining time is spent on locking and unlocking the endpoints.
+    active_duration = (scenario.end_timestamp -
+                       scenario.start_timestamp).total_seconds()
+    logging.info(
+        'Scenario finished in %.1f s, of which %.1f s traffic,'
+        ' %.1f s preparing the flows, waiting for the final results'
+        ' and collecting and analysing them and %.1f s locking and'
+        ' unlocking the endpoints',
+        run_duration,
+        _DURATION.total_seconds(),
+        active_duration - _DURATION.total_seconds(),
+        run_duration - active_duration,
+    )
+    return scenario
+
+
+def main() -> None:
+    """Run the main test procedure."""
+    # 1. Connect to the ByteBlower hosts and create & initialize endpoints
+
+    # Connect to the ByteBlower Server
+    server = Server(_SERVER)
+    logging.info('Connected to ByteBlower Server %s', server.info)
+
+    # Connect to the ByteBlower Meeting Point
+    meeting_point = MeetingPoint(_MEETING_POINT)
+    logging.info(
+        'Connected to ByteBlower meeting point %s',
+        meeting_point.info,
+    )
+
+    # Simulate a host at the WAN-side of the network
+    # Create and initialize a ByteBlowerPort on the given interface
+    # at the connected ByteBlowerServer
+    wan_port = IPv4Port(
+        server,
+        interface=_WAN_INTERFACE,
+        ipv4=_WAN_IPv4,
+        name='WAN',
+    )
+    logging.info(
+        'Initialized WAN port %r'
+        ' with IP address %r, network %r',
+        wan_port.name,
+        wan_port.ip,
+        wan_port.network,
+    )
+
+    # Select the fleet of ByteBlower Endpoints
+    setup_start = perf_counter()
+    uuids = _UUIDS
+    if uuids is None:
+        uuids = discover_endpoints(
+            meeting_point,
+            device_name_prefix=_DEVICE_NAME_PREFIX,
+            maximum_endpoints=_MAXIMUM_ENDPOINTS,
+        )
+    else:
+        uuids = uuids[:_MAXIMUM_ENDPOINTS]
+    if not uuids:
+        raise RuntimeError('No ByteBlower Endpoints available for the test')
+    logging.info('Selected %d ByteBlower Endpoint(s)', len(uuids))
+
+    # Simulate the hosts at the CPE-side of the network
+    # Create and initialize a ByteBlowerEndpoint for every selected device
+    # at the connected Meeting Point
+    endpoints = [
+        endpoint for endpoint in
+        (create_endpoint(meeting_point, uuid) for uuid in uuids)
+        if endpoint is not None
+    ]
+    if not endpoints:
+        raise RuntimeError('None of the ByteBlower Endpoints is available')
+    logging.info(
+        'Initialized %d of %d endpoint(s) in %.1f s',
+        len(endpoints),
+        len(uuids),
+        perf_counter() - setup_start,
+    )
+
+    # 2. Define and run the traffic test
+
+    scenario = run_scenario(wan_port, endpoints)
+
+    # 3. Generate test report
+
+    logging.info('Generating report')
+    report_start = perf_counter()
+    scenario.report()
+    logging.info('Generated reports in %.1f s', perf_counter() - report_start)
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    main()
@@ -0,0 +1,288 @@
+"""Bounded retention of the over-time results of flow analysers."""
+from datetime import timedelta
+from typing import (  # for type hinting
+    Dict,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from byteblower_test_framework.analysis import (
+    HttpAnalyser,
+    LatencyFrameLossAnalyser,
+)
+from pandas import DataFrame, DatetimeIndex, concat
+from pandas import Timestamp  # for type hinting
+
+# How the columns of the over-time results are rolled up.
+#
+# NOTE: The (HTML) report converts the bytes per interval to a bitrate
+#       using the sampling interval of the flow. The values per interval
+#       are therefore *averaged* instead of summed, so the rolled up
+#       results still show the correct bitrates.
+_FRAME_COUNT_AGGREGATION = {
+    'Duration total': 'last',
+    'Packets total': 'last',
+    'Bytes total': 'last',
+    'Duration interval': 'mean',
+    'Packets interval': 'mean',
+    'Bytes interval': 'mean',
+}
+_LATENCY_AGGREGATION = {
+    'Minimum': 'min',
+    'Maximum': 'max',
+    'Average': 'mean',
+    'Jitter': 'mean',
+}
+_TCP_AGGREGATION = {
+    'duration': 'mean',
+    'txTotal': 'last',
+    'rxTotal': 'last',
+    'rttMinimum': 'min',
+    'rttMaximum': 'max',
+    'rttAverage': 'mean',
+    'slowRetransmissions': 'sum',
+    'fastRetransmissions': 'sum',
+}
+_HTTP_AGGREGATION = {
+    'duration': 'mean',
+    'TX Bytes': 'mean',
+    'RX Bytes': 'mean',
+}
+
+
+class RetentionTier(NamedTuple):
+    """Resolution of the results older than a given age."""
+
+    #: Results older than this age are rolled up
+    age: timedelta
+    #: Duration of the rolled up intervals
+    resolution: timedelta
+
+
+class RetentionPolicy(object):
+    """Roll up older over-time results into coarser intervals.
+
+    The most recent results are kept at full resolution. Older results
+    are rolled up into intervals of the resolution of their tier. The
+    number of results stays bounded, no matter how long the test runs.
+
+    Only the intervals which are not rolled up yet are aggregated.
+    """
+
+    __slots__ = ('_tiers', )
+
+    def __init__(self, tiers: Sequence[RetentionTier]) -> None:
+        """Create a retention policy.
+
+        :param tiers: Resolution of the older results. The resolution
+           must increase with the age of the results.
+        :type tiers: Sequence[RetentionTier]
+        :raises ValueError: When the resolution does not increase with age
+        """
+        self._tiers = tuple(sorted(tiers, key=lambda tier: tier.age))
+        for finer, coarser in zip(self._tiers, self._tiers[1:]):
+            if coarser.resolution <= finer.resolution:
+                raise ValueError(
+                    'Retention resolution must increase with the age'
+                    ' of the results'
+                )
+
+    @property
+    def tiers(self) -> Sequence[RetentionTier]:
+        """Return the tiers, sorted by age."""
+        return self._tiers
+
+    @property
+    def rollup_interval(self) -> Optional[timedelta]:
+        """Return how often the results must be rolled up."""
+        if not self._tiers:
+            return None
+        return self._tiers[0].resolution
+
+    def apply(self, df: DataFrame, aggregation: Dict[str, str]) -> DataFrame:
+        """Roll up the older results of an over-time ``DataFrame``.
+
+        The age of the results is relative to the most recent result.
+        Results which are already rolled up stay unchanged.
+
+        :param df: Over-time results, indexed by (sorted) timestamp
+        :type df: DataFrame
+        :param aggregation: How each column is rolled up
+           (``pandas`` aggregation function name)
+        :type aggregation: Dict[str, str]
+        :return: The rolled up results. This is ``df`` itself
+           when there was nothing to roll up.
+        :rtype: DataFrame
+        """
+        if df.empty:
+            return df
+        latest: Timestamp = df.index[-1]
+        # Start with the coarsest tier: it covers the oldest results
+        for tier in reversed(self._tiers):
+            # Only roll up complete intervals, so all rolled up
+            # results cover an interval of the same duration.
+            cutoff = (latest - tier.age).floor(tier.resolution)
+            position = df.index.searchsorted(cutoff)
+            if not position:
+                continue
+            older = df.iloc[:position]
+            buckets = older.index.floor(tier.resolution)
+            # NOTE: Intervals with a single result are already rolled up
+            #       (or rolling them up would not change them).
+            pending = buckets.duplicated(keep=False)
+            if not pending.any():
+                continue
+            pending_results = older[pending]
+            pending_buckets = buckets[pending]
+            rolled_up = pending_results.groupby(pending_buckets).agg(
+                {
+                    column: aggregation.get(column, 'last')
+                    for column in df.columns
+                }
+            )
+            # Keep the timestamp of the last result in each interval
+            timestamps = pending_results.index.to_series()
+            rolled_up.index = DatetimeIndex(
+                timestamps.groupby(pending_buckets).last(),
+                name=df.index.name,
+            )
+            parts = (older[~pending], rolled_up, df.iloc[position:])
+            df = concat(parts).sort_index()
+        return df
+
+
+#: Full resolution for the last 10 minutes, per minute for the last
+#: 6 hours and per hour for the older results.
+DEFAULT_RETENTION_POLICY = RetentionPolicy(
+    (
+        RetentionTier(
+            age=timedelta(minutes=10), resolution=timedelta(minutes=1)
+        ),
+        RetentionTier(age=timedelta(hours=6), resolution=timedelta(hours=1)),
+    )
+)
+
+
+class RetentionLatencyFrameLossAnalyser(LatencyFrameLossAnalyser):
+    """Latency and frame loss analyser with bounded over-time results.
+
+    Behaves like :class:`LatencyFrameLossAnalyser`, but rolls up the older
+    over-time results while the test is running.
+    """
+
+    __slots__ = (
+        '_retention_policy',
+        '_next_rollup',
+    )
+
+    def __init__(
+        self,
+        retention_policy: RetentionPolicy = DEFAULT_RETENTION_POLICY,
+        **kwargs,
+    ) -> None:
+        """Create the analyser.
+
+        :param retention_policy: How the older results are rolled up,
+           defaults to :const:`DEFAULT_RETENTION_POLICY`
+        :type retention_policy: RetentionPolicy, optional
+        :param kwargs: Parameters of :class:`LatencyFrameLossAnalyser`
+        """
+        super().__init__(**kwargs)
+        self._retention_policy = retention_policy
+        self._next_rollup: Optional[Timestamp] = None
+
+    def updatestats(self) -> None:
+        super().updatestats()
+        rx_data = self._data_framecount
+        if not _rollup_due(self, rx_data.over_time):
+            return
+        # NOTE: The result storage is updated with the rolled up results.
+        #       The analysis and reporting read them from the storage.
+        # pylint: disable=protected-access
+        policy = self._retention_policy
+        rx_data._over_time = policy.apply(
+            rx_data.over_time, _FRAME_COUNT_AGGREGATION
+        )
+        latency_data = self._data_latency
+        latency_data._df_latency = policy.apply(
+            latency_data.df_latency, _LATENCY_AGGREGATION
+        )
+        # NOTE: The transmit results are shared by all analysers
+        #       of the flow. Rolling up is idempotent.
+        tx_data = self.flow.stream_frame_count_data
+        if tx_data is not None:
+            tx_data._over_time = policy.apply(
+                tx_data.over_time, _FRAME_COUNT_AGGREGATION
+            )
+
+
+class RetentionHttpAnalyser(HttpAnalyser):
+    """HTTP analyser with bounded over-time results.
+
+    Behaves like :class:`HttpAnalyser`, but rolls up the older
+    over-time results while the test is running.
+    """
+
+    __slots__ = (
+        '_retention_policy',
+        '_next_rollup',
+    )
+
+    def __init__(
+        self,
+        retention_policy: RetentionPolicy = DEFAULT_RETENTION_POLICY,
+        **kwargs,
+    ) -> None:
+        """Create the analyser.
+
+        :param retention_policy: How the older results are rolled up,
+           defaults to :const:`DEFAULT_RETENTION_POLICY`
+        :type retention_policy: RetentionPolicy, optional
+        :param kwargs: Parameters of :class:`HttpAnalyser`
+        """
+        super().__init__(**kwargs)
+        self._retention_policy = retention_policy
+        self._next_rollup: Optional[Timestamp] = None
+
+    def updatestats(self) -> None:
+        super().updatestats()
+        http_data = self._http_data
+        if not _rollup_due(self, http_data.df_http_client):
+            return
+        # NOTE: The result storage is updated with the rolled up results.
+        #       The analysis and reporting read them from the storage.
+        for attribute, aggregation in (
+            ('_df_tcp_client', _TCP_AGGREGATION),
+            ('_df_tcp_server', _TCP_AGGREGATION),
+            ('_df_http_client', _HTTP_AGGREGATION),
+            ('_df_http_server', _HTTP_AGGREGATION),
+        ):
+            setattr(
+                http_data,
+                attribute,
+                self._retention_policy.apply(
+                    getattr(http_data, attribute), aggregation
+                ),
+            )
+
+
+def _rollup_due(
+    analyser: Union[RetentionLatencyFrameLossAnalyser, RetentionHttpAnalyser],
+    df: DataFrame,
+) -> bool:
+    """Return whether the results of the analyser must be rolled up now.
+
+    Rolling up is only needed once per interval of the finest tier.
+    """
+    if df.empty:
+        return False
+    latest: Timestamp = df.index.max()
+    if analyser._next_rollup is not None and latest < analyser._next_rollup:
+        return False
+    rollup_interval = analyser._retention_policy.rollup_interval
+    if rollup_interval is None:
+        return False
+    analyser._next_rollup = latest + rollup_interval
+    return True
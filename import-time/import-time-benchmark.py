@@ -0,0 +1,165 @@
+"""Benchmark the import time of the ByteBlower Test Framework modules."""
+import json
+import logging  # Use the Python default logging interface
+import re
+import subprocess
+import sys
+from argparse import ArgumentParser
+from statistics import median
+from typing import Dict, List, Sequence, Tuple  # for type hinting
+
+# Framework modules which are imported by the example scripts.
+_MODULES = (
+    'byteblower_test_framework.analysis',
+    'byteblower_test_framework.endpoint',
+    'byteblower_test_framework.factory',
+    'byteblower_test_framework.host',
+    'byteblower_test_framework.logging',
+    'byteblower_test_framework.report',
+    'byteblower_test_framework.run',
+    'byteblower_test_framework.traffic',
+)
+
+# Number of new Python processes per measurement.
+_REPEAT = 5
+
+# Number of (heaviest) imported packages to show.
+_TOP = 10
+
+# Allowed increase of the import time compared to the baseline.
+_TOLERANCE = 0.2  # 20 %
+
+# Output line of ``python -X importtime``:
+#   import time: self [us] | cumulative | imported package
+_IMPORT_TIME = re.compile(
+    r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \|'
+    r'(?P<indent>\s+)(?P<package>\S+)$'
+)
+
+
+def _measure(modules: Sequence[str]) -> Tuple[int, Dict[str, int]]:
+    """Import the modules in a new Python process.
+
+    :return: Total import time and the cumulative import time
+       of the top-level imported packages (in microseconds).
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            '; '.join(f'import {module}' for module in modules),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        check=True,
+        universal_newlines=True,
+    )
+    total = 0
+    packages: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match is None:
+            continue
+        cumulative = int(match.group('cumulative'))
+        # Only count the top-level imports, the nested imports
+        # are included in their cumulative time.
+        if len(match.group('indent')) == 1:
+            total += cumulative
+        package = match.group('package').split('.')[0]
+        packages[package] = max(packages.get(package, 0), cumulative)
+    return total, packages
+
+
+def _benchmark(modules: Sequence[str],
+               repeat: int) -> Tuple[float, Dict[str, float]]:
+    """Return the median import time (in ms) of ``repeat`` measurements."""
+    totals: List[int] = []
+    packages: Dict[str, List[int]] = {}
+    for _ in range(repeat):
+        total, package_times = _measure(modules)
+        totals.append(total)
+        for package, cumulative in package_times.items():
+            packages.setdefault(package, []).append(cumulative)
+    return median(totals) / 1e3, {
+        package: median(times) / 1e3
+        for package, times in packages.items()
+    }
+
+
+def main() -> int:
+    """Run the import time benchmark."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=_REPEAT,
+        help='Number of measurements per module (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--save', metavar='FILE', help='Store the results as baseline'
+    )
+    parser.add_argument(
+        '--baseline',
+        metavar='FILE',
+        help='Fail when the import time increased compared to this baseline',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=_TOLERANCE,
+        help='Allowed relative increase in import time'
+        ' (default: %(default)s)',
+    )
+    args = parser.parse_args()
+
+    results: Dict[str, float] = {}
+
+    # Import time of all modules together, as in the example scripts
+    total, packages = _benchmark(_MODULES, args.repeat)
+    results['all'] = total
+    logging.info('All modules: %.1f ms', total)
+    logging.info('Heaviest imported packages (cumulative):')
+    for package, package_time in sorted(packages.items(),
+                                        key=lambda item: item[1],
+                                        reverse=True)[:_TOP]:
+        logging.info('    %-30s %8.1f ms', package, package_time)
+
+    # Import time of each module in a clean interpreter
+    for module in _MODULES:
+        module_time, _ = _benchmark((module, ), args.repeat)
+        results[module] = module_time
+        logging.info('%-40s %8.1f ms', module, module_time)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        logging.info('Stored baseline in %r', args.save)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as baseline_file:
+        baseline: Dict[str, float] = json.load(baseline_file)
+    regressions = 0
+    for name, import_time in results.items():
+        baseline_time = baseline.get(name)
+        if baseline_time is None:
+            continue
+        if import_time > baseline_time * (1 + args.tolerance):
+            regressions += 1
+            logging.error(
+                'Import time regression for %s: %.1f ms (baseline %.1f ms)',
+                name,
+                import_time,
+                baseline_time,
+            )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    sys.exit(main())
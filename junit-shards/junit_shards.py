@@ -0,0 +1,219 @@
+"""Streaming JUnit XML report, split in size-limited shards."""
+import re
+import time
+from datetime import datetime  # for type hinting
+from os import listdir, remove
+from os.path import isdir, join
+from typing import IO, List, Optional  # for type hinting
+from xml.etree.ElementTree import Element, SubElement, tostring
+
+from byteblower_test_framework.report import ByteBlowerReport
+from byteblower_test_framework.traffic import Flow  # for type hinting
+from pandas import DataFrame  # for type hinting
+
+# Default maximum size of a shard (in bytes)
+_DEFAULT_MAXIMUM_SHARD_SIZE = 10 * 1024 * 1024
+
+_XML_HEADER = '<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n'
+_XML_FOOTER = '</testsuites>\n'
+
+
+class ShardedUnitTestReport(ByteBlowerReport):
+    """Generate test report in JUnit XML format, split in shards.
+
+    The test cases of each flow are written to disk as soon as the flow
+    is added to the report. The complete report is never kept in memory.
+
+    When a shard reaches its maximum size (or number of test suites),
+    the next flows are written to a new shard. The shards are stored as
+    ``<output_dir>/<filename>_<n>.xml``.
+    """
+
+    __slots__ = (
+        '_maximum_shard_size',
+        '_maximum_test_suites',
+        '_shard_urls',
+        '_shard_file',
+        '_shard_size',
+        '_shard_test_suites',
+        '_test_suite_counter',
+    )
+
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        filename_prefix: str = 'byteblower',
+        filename: Optional[str] = None,
+        maximum_shard_size: int = _DEFAULT_MAXIMUM_SHARD_SIZE,
+        maximum_test_suites: Optional[int] = None,
+    ) -> None:
+        """Create a sharded ByteBlower JUnit XML report generator.
+
+        :param output_dir: Override the directory where
+           the report files are stored, defaults to ``None``
+           (meaning that the "current directory" will be used)
+        :type output_dir: str, optional
+        :param filename_prefix: Prefix for the ByteBlower report file names,
+           defaults to 'byteblower'
+        :type filename_prefix: str, optional
+        :param filename: Override the complete filename of the report
+           (without shard number), defaults to ``None``
+        :type filename: str, optional
+        :param maximum_shard_size: Maximum size of a shard in bytes,
+           defaults to 10 MiB. A single flow is never split over shards.
+        :type maximum_shard_size: int, optional
+        :param maximum_test_suites: Maximum number of test suites (flows)
+           in a shard, defaults to ``None`` (no limit)
+        :type maximum_test_suites: Optional[int], optional
+        """
+        super().__init__(
+            output_dir=output_dir,
+            filename_prefix=filename_prefix,
+            filename=filename
+        )
+        self._maximum_shard_size = maximum_shard_size
+        self._maximum_test_suites = maximum_test_suites
+        self._shard_urls: List[str] = []
+        self._shard_file: Optional[IO[str]] = None
+        self._shard_size = 0
+        self._shard_test_suites = 0
+        self._test_suite_counter = 1
+
+    @property
+    def report_url(self) -> str:
+        """Return the name and location of the first report shard.
+
+        See :attr:`shard_urls` for all written shards.
+        """
+        return self._shard_url(1)
+
+    @property
+    def shard_urls(self) -> List[str]:
+        """Return the names and locations of the written shards."""
+        return self._shard_urls
+
+    def add_flow(self, flow: Flow) -> None:
+        """Add the flow info and write it to the current shard.
+
+        :param flow: Flow to add the information for
+        :type flow: Flow
+        """
+        test_suite = self._render_flow(flow)
+        if test_suite is None:
+            return
+        self._write(tostring(test_suite, encoding='unicode') + '\n')
+
+    def render(
+        self, api_version: str, framework_version: str, port_list: DataFrame,
+        scenario_start_timestamp: Optional[datetime],
+        scenario_end_timestamp: Optional[datetime]
+    ) -> None:
+        """Finish the report.
+
+        :param port_list: Configuration of the ByteBlower Ports.
+        :type port_list: DataFrame
+        """
+        self._close_shard()
+
+    def clear(self) -> None:
+        """Start with empty report contents."""
+        self._close_shard()
+        # Remove the shards of a previous report with the same filename.
+        # NOTE: Only remove files which have the exact shard file name,
+        #       other files in the output directory are left alone.
+        if isdir(self._output_dir):
+            shard_name = re.compile(
+                re.escape(self._filename) + r'_\d{4,}\.xml'
+            )
+            for name in listdir(self._output_dir):
+                if shard_name.fullmatch(name):
+                    remove(join(self._output_dir, name))
+        self._shard_urls = []
+        self._test_suite_counter = 1
+
+    def _render_flow(self, flow: Flow) -> Optional[Element]:
+        """Return the test suite with the test cases of a flow."""
+        # NOTE: The testcase classname is used as "suite" name
+        #       in the GitLab Unit test reporting.
+        test_suite = Element('testsuite')
+        tests = failures = skipped = 0
+        for analyser in flow.analysers:
+            failure_causes = analyser.failure_causes
+            stderr = '\n'.join(failure_causes) if failure_causes else None
+            test_case = SubElement(
+                test_suite,
+                'testcase',
+                name=analyser.type,
+                classname=flow.name,
+                timestamp=str(time.time()),
+            )
+            tests += 1
+            # NOTE: Set to SKIPPED if no analysis was done:
+            if analyser.has_passed is None:
+                skipped += 1
+                SubElement(
+                    test_case,
+                    'skipped',
+                    type='skipped',
+                    message='No analysis performed',
+                )
+            elif not analyser.has_passed:
+                failures += 1
+                SubElement(
+                    test_case,
+                    'failure',
+                    type='failure',
+                    message=stderr or 'see analysis log for details',
+                )
+                stderr = None
+            if analyser.log:
+                SubElement(test_case, 'system-out').text = analyser.log
+            if stderr:
+                SubElement(test_case, 'system-err').text = stderr
+        if not tests:
+            return None
+        test_suite.attrib.update(
+            name=f'{self._test_suite_counter!s}_ {flow.name}',
+            tests=str(tests),
+            failures=str(failures),
+            skipped=str(skipped),
+            errors='0',
+        )
+        self._test_suite_counter += 1
+        return test_suite
+
+    def _write(self, test_suite: str) -> None:
+        size = len(test_suite.encode('utf-8'))
+        if self._shard_file is not None and self._shard_full(size):
+            self._close_shard()
+        if self._shard_file is None:
+            self._open_shard()
+        self._shard_file.write(test_suite)
+        self._shard_size += size
+        self._shard_test_suites += 1
+
+    def _shard_full(self, size: int) -> bool:
+        if self._shard_size + size > self._maximum_shard_size:
+            return True
+        return (
+            self._maximum_test_suites is not None
+            and self._shard_test_suites >= self._maximum_test_suites
+        )
+
+    def _shard_url(self, number: int) -> str:
+        return join(self._output_dir, f'{self._filename}_{number:04d}.xml')
+
+    def _open_shard(self) -> None:
+        shard_url = self._shard_url(len(self._shard_urls) + 1)
+        self._shard_file = open(shard_url, 'w', encoding='utf-8')
+        self._shard_file.write(_XML_HEADER)
+        self._shard_urls.append(shard_url)
+        self._shard_size = len(_XML_HEADER) + len(_XML_FOOTER)
+        self._shard_test_suites = 0
+
+    def _close_shard(self) -> None:
+        if self._shard_file is None:
+            return
+        self._shard_file.write(_XML_FOOTER)
+        self._shard_file.close()
+        self._shard_file = None
@@ -0,0 +1,47 @@
+"""UDP frame blasting test for a single CPE."""
+import logging  # Use the Python default logging interface
+import sys
+from argparse import ArgumentParser
+
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+
+from cpe_tests import SERVER, run_cpe_test  # Test of a single CPE
+
+
+def main(cpe_name: str, cpe_interface: str) -> bool:
+    """Run the main test procedure.
+
+    :param cpe_name: Name of the CPE, used in the report file names
+    :type cpe_name: str
+    :param cpe_interface: ByteBlower interface connected to the CPE
+    :type cpe_interface: str
+    :return: Whether all flow analysers passed
+    :rtype: bool
+    """
+    # Connect to the ByteBlower Server
+    server = Server(SERVER)
+    logging.info('Connected to ByteBlower Server %s', server.info)
+
+    # Create the ports and flows, run the test and generate the reports
+    return run_cpe_test(server, cpe_name, cpe_interface)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument('name', help='Name of the CPE')
+    parser.add_argument(
+        'interface', help='ByteBlower interface connected to the CPE'
+    )
+    args = parser.parse_args()
+
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    # Exit with a non-zero exit code when the test did not pass
+    sys.exit(0 if main(args.name, args.interface) else 1)
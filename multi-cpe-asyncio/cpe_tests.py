@@ -0,0 +1,325 @@
+"""Run the CPE test for many CPEs concurrently from an asyncio event loop."""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import getcwd, makedirs
+from os.path import join
+from typing import List, NamedTuple, Optional, Tuple  # for type hinting
+
+from byteblower_test_framework.analysis import \
+    LatencyFrameLossAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    IPv4Port,
+    NatDiscoveryIPv4Port,
+)
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.report import (  # Reporting
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+    ByteBlowerUnitTestReport,
+)
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import (  # Traffic generation
+    FrameBlastingFlow,
+    IPv4Frame,
+)
+
+# ByteBlower Server connection parameters
+SERVER = 'byteblower-tutorial-3100.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'trunk-1-5'
+
+# ByteBlower Port Layer 3 addressing parameters
+# DHCP IPv4 configuration:
+# NOTE: Multiple CPE tests run at the same time,
+#       so each test needs its own WAN port address.
+_WAN_IPv4 = 'dhcp'
+
+_CPE_IPv4 = 'dhcp'
+
+# The generated reports will be stored to the 'reports' subdirectory.
+REPORT_PATH = join(getcwd(), 'reports')
+
+# Maximum number of CPE tests which run at the same time.
+CONCURRENCY = 50
+
+# Maximum duration of a single CPE test (in seconds).
+# This includes port initialization, running the traffic
+# and generating the reports.
+TIMEOUT = 120.0
+
+
+class CpeTestResult(NamedTuple):
+    """Outcome of the test of a single CPE."""
+
+    #: Name of the CPE
+    name: str
+    #: Whether all flow analysers passed.
+    #: ``None`` when the test did not finish in time.
+    passed: Optional[bool]
+    #: Duration of the CPE test in seconds
+    duration: float
+    #: Error which prevented running the CPE test
+    error: Optional[BaseException] = None
+
+
+def run_cpe_test(
+    server: Server,
+    cpe_name: str,
+    cpe_interface: str,
+    report_path: str = REPORT_PATH,
+) -> bool:
+    """Run the UDP frame blasting test for a single CPE.
+
+    .. note::
+       This blocks until the test is finished and the reports are
+       generated.
+
+    :param server: Connected ByteBlower Server
+    :type server: Server
+    :param cpe_name: Name of the CPE, used in the report file names
+    :type cpe_name: str
+    :param cpe_interface: ByteBlower interface connected to the CPE
+    :type cpe_interface: str
+    :param report_path: Directory where the reports are stored,
+       defaults to :const:`REPORT_PATH`
+    :type report_path: str, optional
+    :return: Whether all flow analysers passed
+    :rtype: bool
+    """
+    # 1. Create a new Scenario
+    scenario = Scenario()
+
+    # Store the reports of each CPE in separate files
+    report_prefix = f'byteblower_{cpe_name}'
+
+    # Generate a HTML report
+    byteblower_html_report = ByteBlowerHtmlReport(
+        output_dir=report_path, filename_prefix=report_prefix
+    )
+    scenario.add_report(byteblower_html_report)
+    # Generate a JUnit XML report
+    byteblower_unittest_report = ByteBlowerUnitTestReport(
+        output_dir=report_path, filename_prefix=report_prefix
+    )
+    scenario.add_report(byteblower_unittest_report)
+    # Generate a JSON summary report
+    byteblower_summary_report = ByteBlowerJsonReport(
+        output_dir=report_path, filename_prefix=report_prefix
+    )
+    scenario.add_report(byteblower_summary_report)
+
+    # 2. Create & initialize ports
+
+    # Simulate a host at the WAN-side of the network
+    # Create and initialize a ByteBlowerPort on the given interface
+    # at the connected ByteBlowerServer
+    wan_port = IPv4Port(
+        server,
+        interface=_WAN_INTERFACE,
+        ipv4=_WAN_IPv4,
+        name=f'WAN {cpe_name}',
+    )
+    logging.info(
+        'Initialized WAN port %r'
+        ' with IP address %r, network %r',
+        wan_port.name,
+        wan_port.ip,
+        wan_port.network,
+    )
+
+    # Simulate a host at the CPE-side of the network
+    # Create and initialize a ByteBlowerPort on the given interface
+    # at the connected ByteBlowerServer
+    cpe_port = NatDiscoveryIPv4Port(
+        server,
+        interface=cpe_interface,
+        ipv4=_CPE_IPv4,
+        name=cpe_name,
+    )
+    logging.info(
+        'Initialized CPE port %r'
+        ' with IP address %r, network %r',
+        cpe_port.name,
+        cpe_port.ip,
+        cpe_port.network,
+    )
+
+    # 3. Define the traffic test (flows)
+
+    # Downstream UDP flow (frame blasting)
+
+    # Create a UDP frame
+    # Enable the "latency tagging" so we can analyze latency
+    ds_frame = IPv4Frame(latency_tag=True)
+    # Create a Stream of 10s @ 1000fps
+    ds_udp_flow = FrameBlastingFlow(
+        wan_port,
+        cpe_port,
+        name=f'Downstream UDP flow {cpe_name}',
+        frame_rate=1000,
+        number_of_frames=10000,
+        frame_list=[ds_frame],
+    )
+
+    # Analyze frame loss and latency over time
+    ds_udp_analyser = LatencyFrameLossAnalyser()
+    ds_udp_flow.add_analyser(ds_udp_analyser)
+
+    # Add the downstream UDP flow to the scenario
+    scenario.add_flow(ds_udp_flow)
+    logging.info('Created downstream UDP flow %s', ds_udp_flow)
+
+    # Upstream UDP flow (frame blasting)
+
+    # Create a UDP frame
+    # Enable the "latency tagging" so we can analyze latency
+    us_frame = IPv4Frame(latency_tag=True)
+    # Create a Stream of 10s @ 500fps
+    us_udp_flow = FrameBlastingFlow(
+        cpe_port,
+        wan_port,
+        name=f'Upstream UDP flow {cpe_name}',
+        frame_rate=500,
+        number_of_frames=5000,
+        frame_list=[us_frame],
+    )
+
+    # Analyze frame loss and latency over time
+    us_udp_analyser = LatencyFrameLossAnalyser()
+    us_udp_flow.add_analyser(us_udp_analyser)
+
+    # Add the upstream UDP flow to the scenario
+    scenario.add_flow(us_udp_flow)
+    logging.info('Created upstream UDP flow %s', us_udp_flow)
+
+    # 4. Run the traffic test
+
+    # Run the scenario
+    # The scenario will run for 10 seconds since we have a limited
+    # number of frames configured in the FrameBlastingFlows.
+    logging.info('Start scenario of CPE %r', cpe_name)
+    scenario.run()
+
+    # 5. Generate test report
+
+    logging.info('Generating report of CPE %r', cpe_name)
+    scenario.report()
+
+    return all(
+        analyser.has_passed for analyser in (ds_udp_analyser, us_udp_analyser)
+    )
+
+
+async def _run_cpe_test(
+    executor: ThreadPoolExecutor,
+    server: Server,
+    name: str,
+    interface: str,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    report_path: str,
+) -> CpeTestResult:
+    """Run the test of a single CPE in a worker thread."""
+    async with semaphore:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        logging.info('Started test of CPE %r', name)
+        test = loop.run_in_executor(
+            executor,
+            partial(run_cpe_test, server, name, interface, report_path),
+        )
+        try:
+            passed: Optional[bool] = await asyncio.wait_for(
+                asyncio.shield(test), timeout
+            )
+        except asyncio.TimeoutError:
+            logging.error(
+                'Test of CPE %r did not finish within %.0f s',
+                name,
+                timeout,
+            )
+            passed = None
+            # NOTE: The blocking ByteBlower API calls can not be
+            #       interrupted. The test keeps its worker thread
+            #       (and its place in the semaphore) until it finished.
+            await asyncio.gather(test, return_exceptions=True)
+        duration = loop.time() - start
+        logging.info(
+            'Finished test of CPE %r in %.1f s (passed: %r)',
+            name,
+            duration,
+            passed,
+        )
+        return CpeTestResult(name, passed, duration)
+
+
+async def run_cpe_tests(
+    cpes: List[Tuple[str, str]],
+    concurrency: int = CONCURRENCY,
+    timeout: float = TIMEOUT,
+    report_path: str = REPORT_PATH,
+    server_address: str = SERVER,
+) -> List[CpeTestResult]:
+    """Run the tests for all CPEs.
+
+    All CPE tests share a single connection to the ByteBlower Server.
+    The blocking ByteBlower API calls of each test run in a worker thread.
+    The number of worker threads is limited to ``concurrency``.
+
+    A CPE test which fails to run does not stop the tests of the other
+    CPEs. Its error is logged and returned in its result.
+
+    :param cpes: Name and ByteBlower interface of each CPE
+    :type cpes: List[Tuple[str, str]]
+    :param concurrency: Maximum number of CPE tests which run at the same
+       time, defaults to :const:`CONCURRENCY`
+    :type concurrency: int, optional
+    :param timeout: Maximum duration of a single CPE test in seconds,
+       defaults to :const:`TIMEOUT`
+    :type timeout: float, optional
+    :param report_path: Directory where the reports are stored,
+       defaults to :const:`REPORT_PATH`
+    :type report_path: str, optional
+    :param server_address: Address of the ByteBlower Server,
+       defaults to :const:`SERVER`
+    :type server_address: str, optional
+    :return: Results of the CPE tests
+    :rtype: List[CpeTestResult]
+    """
+    makedirs(report_path, exist_ok=True)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # Connect to the ByteBlower Server
+        server = await loop.run_in_executor(executor, Server, server_address)
+        logging.info('Connected to ByteBlower Server %s', server.info)
+
+        outcomes = await asyncio.gather(
+            *(
+                _run_cpe_test(
+                    executor,
+                    server,
+                    name,
+                    interface,
+                    semaphore,
+                    timeout,
+                    report_path,
+                ) for name, interface in cpes
+            ),
+            return_exceptions=True,
+        )
+    results: List[CpeTestResult] = []
+    for (name, _interface), outcome in zip(cpes, outcomes):
+        if isinstance(outcome, BaseException):
+            logging.error(
+                'Test of CPE %r failed to run: %s',
+                name,
+                outcome,
+                exc_info=outcome,
+            )
+            outcome = CpeTestResult(name, None, 0.0, outcome)
+        results.append(outcome)
+    return results
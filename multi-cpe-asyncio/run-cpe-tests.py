@@ -0,0 +1,84 @@
+"""Run the CPE test for many CPEs concurrently from a single event loop."""
+import asyncio
+import logging  # Use the Python default logging interface
+import sys
+from argparse import ArgumentParser
+from typing import Tuple  # for type hinting
+
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+
+from cpe_tests import (  # Concurrent CPE tests
+    CONCURRENCY,
+    TIMEOUT,
+    run_cpe_tests,
+)
+
+
+def _parse_cpe(value: str) -> Tuple[str, str]:
+    name, separator, interface = value.partition('=')
+    if not separator or not name or not interface:
+        raise ValueError(f'Invalid CPE definition: {value!r}')
+    return name, interface
+
+
+def main() -> int:
+    """Run the CPE tests and summarize their results."""
+    parser = ArgumentParser(description=__doc__, fromfile_prefix_chars='@')
+    parser.add_argument(
+        'cpes',
+        metavar='NAME=INTERFACE',
+        type=_parse_cpe,
+        nargs='+',
+        help='Name of the CPE and the ByteBlower interface it is connected'
+        ' to. Use @FILE to read the CPEs from a file (one per line).',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=CONCURRENCY,
+        help='Maximum number of tests running at the same time'
+        ' (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=TIMEOUT,
+        help='Maximum duration of a single CPE test in seconds'
+        ' (default: %(default)s)',
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run_cpe_tests(
+            args.cpes, concurrency=args.concurrency, timeout=args.timeout
+        )
+    )
+
+    failed = [result for result in results if not result.passed]
+    logging.info(
+        '%d of %d CPE test(s) passed',
+        len(results) - len(failed),
+        len(results),
+    )
+    for result in failed:
+        if result.error is not None:
+            logging.error(
+                'CPE test %r failed to run: %s', result.name, result.error
+            )
+        elif result.passed is None:
+            logging.error('CPE test %r timed out', result.name)
+        else:
+            logging.error('CPE test %r failed', result.name)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""Split ByteBlower JSON reports in chunks and read the chunked reports."""
+import json
+import logging  # Use the Python default logging interface
+from argparse import ArgumentParser
+from os.path import splitext
+
+from report_archive import (  # Chunked reports
+    iter_flows,
+    read_flow,
+    read_index,
+    split_json_report,
+)
+
+
+def main() -> None:
+    """Split reports in chunks or read a chunked report."""
+    parser = ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    split = commands.add_parser(
+        'split', help='Split (existing) ByteBlower JSON reports in chunks'
+    )
+    split.add_argument('reports', nargs='+', help='JSON report file(s)')
+    split.add_argument(
+        '--no-compression',
+        action='store_true',
+        help='Do not compress the flow chunks',
+    )
+
+    flows = commands.add_parser('flows', help='List the flows of a report')
+    flows.add_argument('index', help='Index file of the chunked report')
+
+    show = commands.add_parser('show', help='Show the results of a flow')
+    show.add_argument('index', help='Index file of the chunked report')
+    show.add_argument(
+        'flow', nargs='?', help='Name of the flow (default: all flows)'
+    )
+
+    args = parser.parse_args()
+
+    if args.command == 'split':
+        compression = None if args.no_compression else 'gzip'
+        for report in args.reports:
+            # Store the chunks next to the report: <report name>/
+            index_url = split_json_report(
+                report, splitext(report)[0], compression=compression
+            )
+            logging.info('Stored chunked report %r', index_url)
+    elif args.command == 'flows':
+        for flow in read_index(args.index)['flows']:
+            passed = flow.get('status', {}).get('passed')
+            print(f"{flow['name']}\t{flow.get('type')}\tpassed={passed}")
+    elif args.flow is not None:
+        print(json.dumps(read_flow(args.index, args.flow), indent=2))
+    else:
+        for flow in iter_flows(args.index):
+            print(json.dumps(flow))
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    main()
@@ -0,0 +1,279 @@
+"""Compressed and chunked ByteBlower report artefacts."""
+import gzip
+import json
+import shutil
+from datetime import datetime  # for type hinting
+from os import makedirs, replace
+from os.path import dirname, join
+from typing import (  # for type hinting
+    IO,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+from byteblower_test_framework.report import (
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+)
+from pandas import DataFrame  # for type hinting
+
+# Name of the index file of a chunked JSON report
+_INDEX_FILE = 'index.json'
+
+# Subdirectory with the flow chunks of a chunked JSON report
+_FLOW_DIR = 'flows'
+
+# Flow information which is also stored in the index
+_INDEXED_FLOW_KEYS = ('name', 'type', 'source', 'destination', 'status')
+
+# Supported compression of the flow chunks, by file extension
+_COMPRESSION_EXTENSIONS = {
+    None: '.json',
+    'gzip': '.json.gz',
+}
+
+
+class ChunkedJsonReport(ByteBlowerJsonReport):
+    """JSON report, split in a (compressed) file for each flow.
+
+    The report is stored in the directory ``<output_dir>/<filename>/``:
+
+    * ``index.json``: The report content, with only the name, type,
+      source, destination, status and chunk file of each flow.
+    * ``flows/<n>.json.gz``: The complete results of a single flow.
+
+    The results of a single flow can be read without reading the other
+    flows, see :func:`read_flow`.
+    """
+
+    __slots__ = ('_compression', )
+
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        filename_prefix: str = 'byteblower',
+        filename: Optional[str] = None,
+        compression: Optional[str] = 'gzip',
+    ) -> None:
+        """Create a chunked ByteBlower JSON report generator.
+
+        :param output_dir: Override the directory where
+           the report is stored, defaults to ``None``
+           (meaning that the "current directory" will be used)
+        :type output_dir: str, optional
+        :param filename_prefix: Prefix for the ByteBlower report
+           (directory) name, defaults to 'byteblower'
+        :type filename_prefix: str, optional
+        :param filename: Override the complete (directory) name of
+           the report, defaults to ``None``
+        :type filename: str, optional
+        :param compression: Compression of the flow chunks:
+           ``'gzip'`` or ``None`` (no compression), defaults to ``'gzip'``
+        :type compression: Optional[str], optional
+        :raises ValueError: When an unsupported compression is given
+        """
+        if compression not in _COMPRESSION_EXTENSIONS:
+            raise ValueError(f'Unsupported compression: {compression!r}')
+        super().__init__(
+            output_dir=output_dir,
+            filename_prefix=filename_prefix,
+            filename=filename
+        )
+        self._compression = compression
+
+    @property
+    def report_url(self) -> str:
+        """Return the location of the index of the generated report."""
+        return join(self._output_dir, self._filename, _INDEX_FILE)
+
+    def render(
+        self, api_version: str, framework_version: str, port_list: DataFrame,
+        scenario_start_timestamp: Optional[datetime],
+        scenario_end_timestamp: Optional[datetime]
+    ) -> None:
+        """Render the report.
+
+        :param port_list: Configuration of the ByteBlower Ports.
+        :type port_list: DataFrame
+        """
+        index_url = self.report_url
+        makedirs(join(dirname(index_url), _FLOW_DIR), exist_ok=True)
+        # NOTE: The JSON report writes the complete report to our
+        #       ``report_url``. It is replaced by the index afterwards.
+        super().render(
+            api_version,
+            framework_version,
+            port_list,
+            scenario_start_timestamp,
+            scenario_end_timestamp,
+        )
+        with open(index_url, 'r', encoding='utf-8') as report_file:
+            content: Dict[str, Any] = json.load(report_file)
+        _write_chunks(content, dirname(index_url), self._compression)
+
+
+class CompressedHtmlReport(ByteBlowerHtmlReport):
+    """HTML report, stored as a gzip-compressed file.
+
+    The report is stored as ``<output_dir>/<filename>.html.gz``.
+    """
+
+    __slots__ = ()
+
+    @property
+    def report_url(self) -> str:
+        """Return the location of the generated report."""
+        return join(self._output_dir, self._filename + '.html.gz')
+
+    def render(
+        self, api_version: str, framework_version: str, port_list: DataFrame,
+        scenario_start_timestamp: Optional[datetime],
+        scenario_end_timestamp: Optional[datetime]
+    ) -> None:
+        """Render the report.
+
+        :param port_list: Configuration of the ByteBlower Ports.
+        :type port_list: DataFrame
+        """
+        report_url = self.report_url
+        # NOTE: The HTML report writes the uncompressed report to our
+        #       ``report_url``. It is compressed afterwards.
+        super().render(
+            api_version,
+            framework_version,
+            port_list,
+            scenario_start_timestamp,
+            scenario_end_timestamp,
+        )
+        compressed_url = report_url + '.tmp'
+        with open(report_url, 'rb') as report_file, \
+                gzip.open(compressed_url, 'wb') as compressed_file:
+            shutil.copyfileobj(report_file, compressed_file)
+        replace(compressed_url, report_url)
+
+
+def split_json_report(
+    report_url: str,
+    report_dir: str,
+    compression: Optional[str] = 'gzip',
+) -> str:
+    """Split an existing ByteBlower JSON report in chunks.
+
+    :param report_url: Location of the JSON report file
+    :type report_url: str
+    :param report_dir: Directory to store the chunked report
+    :type report_dir: str
+    :param compression: Compression of the flow chunks:
+       ``'gzip'`` or ``None`` (no compression), defaults to ``'gzip'``
+    :type compression: Optional[str], optional
+    :raises ValueError: When an unsupported compression is given
+    :return: Location of the index of the chunked report
+    :rtype: str
+    """
+    if compression not in _COMPRESSION_EXTENSIONS:
+        raise ValueError(f'Unsupported compression: {compression!r}')
+    with open(report_url, 'r', encoding='utf-8') as report_file:
+        content: Dict[str, Any] = json.load(report_file)
+    makedirs(join(report_dir, _FLOW_DIR), exist_ok=True)
+    _write_chunks(content, report_dir, compression)
+    return join(report_dir, _INDEX_FILE)
+
+
+def read_index(index_url: str) -> Dict[str, Any]:
+    """Read the index of a chunked JSON report.
+
+    :param index_url: Location of the index file
+    :type index_url: str
+    :return: Report content, with the flow summaries and chunk files
+    :rtype: Dict[str, Any]
+    """
+    with open(index_url, 'r', encoding='utf-8') as index_file:
+        return json.load(index_file)
+
+
+def read_flow(index_url: str, name: str) -> Dict[str, Any]:
+    """Read the complete results of a single flow.
+
+    Only the index and the chunk of the flow are read.
+
+    :param index_url: Location of the index file
+    :type index_url: str
+    :param name: Name of the flow
+    :type name: str
+    :raises KeyError: When the report has no flow with the given name
+    :return: Flow results, as in the ByteBlower JSON report
+    :rtype: Dict[str, Any]
+    """
+    for flow in read_index(index_url)['flows']:
+        if flow['name'] == name:
+            return _read_chunk(dirname(index_url), flow['chunk'])
+    raise KeyError(name)
+
+
+def iter_flows(index_url: str) -> Iterator[Dict[str, Any]]:
+    """Read the complete results of all flows, one flow at a time.
+
+    :param index_url: Location of the index file
+    :type index_url: str
+    :return: Flow results, as in the ByteBlower JSON report
+    :rtype: Iterator[Dict[str, Any]]
+    """
+    report_dir = dirname(index_url)
+    for flow in read_index(index_url)['flows']:
+        yield _read_chunk(report_dir, flow['chunk'])
+
+
+def read_report(index_url: str) -> Dict[str, Any]:
+    """Read the complete content of a chunked JSON report.
+
+    :param index_url: Location of the index file
+    :type index_url: str
+    :return: Report content, as in the ByteBlower JSON report
+    :rtype: Dict[str, Any]
+    """
+    content = read_index(index_url)
+    report_dir = dirname(index_url)
+    content['flows'] = [
+        _read_chunk(report_dir, flow['chunk']) for flow in content['flows']
+    ]
+    return content
+
+
+def _write_chunks(
+    content: Dict[str, Any], report_dir: str, compression: Optional[str]
+) -> None:
+    """Write the flow chunks and replace the report by its index."""
+    extension = _COMPRESSION_EXTENSIONS[compression]
+    index_flows: List[Dict[str, Any]] = []
+    for number, flow in enumerate(content.get('flows') or [], start=1):
+        chunk = f'{_FLOW_DIR}/{number:05d}{extension}'
+        with _open_chunk(report_dir, chunk, 'wt') as chunk_file:
+            json.dump(flow, chunk_file)
+        index_flow = {
+            key: flow[key]
+            for key in _INDEXED_FLOW_KEYS
+            if key in flow
+        }
+        index_flow['chunk'] = chunk
+        index_flows.append(index_flow)
+    content['flows'] = index_flows
+
+    index_url = join(report_dir, _INDEX_FILE)
+    with open(index_url + '.tmp', 'w', encoding='utf-8') as index_file:
+        json.dump(content, index_file)
+    replace(index_url + '.tmp', index_url)
+
+
+def _read_chunk(report_dir: str, chunk: str) -> Dict[str, Any]:
+    with _open_chunk(report_dir, chunk, 'rt') as chunk_file:
+        return json.load(chunk_file)
+
+
+def _open_chunk(report_dir: str, chunk: str, mode: str) -> IO[str]:
+    path = join(report_dir, *chunk.split('/'))
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
@@ -0,0 +1,109 @@
+"""Compare ByteBlower JSON reports and flag regressions."""
+import logging  # Use the Python default logging interface
+import sys
+from argparse import ArgumentParser
+from time import perf_counter
+from typing import Optional  # for type hinting
+
+from report_diff import Tolerances, compare, load_reports  # Report diffing
+
+
+def _format_p_value(p_value: Optional[float]) -> str:
+    if p_value is None:
+        return 'n/a'
+    return f'{p_value:.2g}'
+
+
+def main() -> int:
+    """Compare the candidate report against the baseline report(s)."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        'baseline',
+        nargs='+',
+        help='Baseline JSON report(s). The results of multiple reports'
+        ' are pooled.',
+    )
+    parser.add_argument('candidate', help='Candidate JSON report')
+    parser.add_argument(
+        '--alpha',
+        type=float,
+        default=Tolerances.alpha,
+        help='Significance level (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--relative-change',
+        type=float,
+        default=Tolerances.relative_change,
+        help='Minimum relative change of goodput, latency and MOS'
+        ' (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--loss-change',
+        type=float,
+        default=Tolerances.loss_change,
+        help='Minimum absolute change of the frame loss ratio'
+        ' (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--distribution-distance',
+        type=float,
+        default=Tolerances.distribution_distance,
+        help='Minimum Kolmogorov-Smirnov distance between the latency'
+        ' distributions (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Show all compared metrics, not only the significant changes',
+    )
+    args = parser.parse_args()
+
+    tolerances = Tolerances(
+        alpha=args.alpha,
+        relative_change=args.relative_change,
+        loss_change=args.loss_change,
+        distribution_distance=args.distribution_distance,
+    )
+
+    compare_start = perf_counter()
+    baseline = load_reports(args.baseline)
+    candidate = load_reports([args.candidate])
+    changes = compare(baseline, candidate, tolerances=tolerances)
+    compare_duration = perf_counter() - compare_start
+
+    for name in sorted(baseline.keys() - candidate.keys()):
+        logging.warning('Flow %r is missing in the candidate report', name)
+    for name in sorted(candidate.keys() - baseline.keys()):
+        logging.warning('Flow %r is missing in the baseline report(s)', name)
+
+    for change in changes:
+        if not args.all and not change.significant:
+            continue
+        if change.regression:
+            verdict = 'REGRESSION'
+        elif change.significant:
+            verdict = 'IMPROVEMENT'
+        else:
+            verdict = '-'
+        print(
+            f'{verdict}\t{change.flow}\t{change.metric}'
+            f'\t{change.baseline:g}\t{change.candidate:g}'
+            f'\tp={_format_p_value(change.p_value)}'
+        )
+
+    regressions = sum(1 for change in changes if change.regression)
+    logging.info(
+        'Compared %d metric(s) of %d flow(s) in %.3f s: %d regression(s)',
+        len(changes),
+        len(candidate.keys() & baseline.keys()),
+        compare_duration,
+        regressions,
+    )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    sys.exit(main())
@@ -0,0 +1,453 @@
+"""Compare ByteBlower JSON reports and detect regressions."""
+import json
+import logging
+import re
+from dataclasses import dataclass
+from math import erfc, exp, sqrt
+from statistics import mean, stdev
+from typing import (  # for type hinting
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# ISO 8601 duration, as written by pandas for the interval durations
+_ISO_DURATION = re.compile(
+    r'P(?P<days>\d+)DT(?P<hours>\d+)H(?P<minutes>\d+)M'
+    r'(?P<seconds>\d+(?:\.\d+)?)S$'
+)
+
+# Latency summary values which are compared over the test runs
+_LATENCY_METRICS = ('average', 'jitter', 'maximum')
+
+
+@dataclass(frozen=True)
+class Tolerances:
+    """When a change between baseline and candidate is flagged.
+
+    A change is only flagged when it is statistically significant
+    *and* large enough to matter. With millions of frames per flow,
+    even tiny differences are statistically significant.
+    """
+
+    #: Significance level of the statistical tests
+    alpha: float = 0.01
+    #: Minimum relative change of goodput, latency and MOS
+    relative_change: float = 0.1
+    #: Minimum absolute change of the frame loss ratio
+    loss_change: float = 0.001
+    #: Minimum Kolmogorov-Smirnov distance between latency distributions
+    distribution_distance: float = 0.05
+
+
+class Change(NamedTuple):
+    """Comparison of a single metric of a flow."""
+
+    #: Name of the flow
+    flow: str
+    #: Compared metric
+    metric: str
+    #: Value in the baseline report(s)
+    baseline: float
+    #: Value in the candidate report
+    candidate: float
+    #: p-value of the statistical test, ``None`` when not tested
+    p_value: Optional[float]
+    #: Whether the change is significant (given the tolerances)
+    significant: bool
+    #: Whether the candidate is worse than the baseline
+    worse: bool
+
+    @property
+    def regression(self) -> bool:
+        """Return whether the change is a significant degradation."""
+        return self.significant and self.worse
+
+
+class _FlowResults(object):
+    """Results of a flow, pooled over one or more reports."""
+
+    __slots__ = (
+        'runs',
+        'tx_packets',
+        'rx_packets',
+        'latency_histogram',
+        'goodput',
+        'scalars',
+    )
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.tx_packets = 0
+        self.rx_packets = 0
+        # Received packets by latency bucket start [ms]
+        self.latency_histogram: Dict[float, int] = {}
+        # Goodput [bits/s] for each result interval
+        self.goodput: List[float] = []
+        # Summary values, one per report
+        self.scalars: Dict[str, List[float]] = {}
+
+    def add_scalar(self, name: str, value: Optional[float]) -> None:
+        if value is not None:
+            self.scalars.setdefault(name, []).append(float(value))
+
+
+def load_reports(reports: Iterable[str]) -> Dict[str, _FlowResults]:
+    """Load and pool the flow results of ByteBlower JSON reports.
+
+    Flows are lined up by their name.
+
+    :param reports: Locations of the JSON report files
+    :type reports: Iterable[str]
+    :return: Pooled results, by flow name
+    :rtype: Dict[str, _FlowResults]
+    """
+    flows: Dict[str, _FlowResults] = {}
+    for report in reports:
+        with open(report, 'r', encoding='utf-8') as report_file:
+            content = json.load(report_file)
+        seen = set()
+        for flow in content.get('flows') or []:
+            name = flow['name']
+            if name in seen:
+                logging.warning(
+                    'Report %r: ignoring duplicate flow %r', report, name
+                )
+                continue
+            seen.add(name)
+            flow_results = flows.setdefault(name, _FlowResults())
+            _add_flow(flow_results, flow)
+    return flows
+
+
+def compare(
+    baseline: Dict[str, _FlowResults],
+    candidate: Dict[str, _FlowResults],
+    tolerances: Tolerances = Tolerances(),
+) -> List[Change]:
+    """Compare the flow results of the candidate against the baseline.
+
+    :param baseline: Pooled results of the baseline report(s)
+    :type baseline: Dict[str, _FlowResults]
+    :param candidate: Results of the candidate report
+    :type candidate: Dict[str, _FlowResults]
+    :param tolerances: When a change is flagged,
+       defaults to :class:`Tolerances()`
+    :type tolerances: Tolerances, optional
+    :return: Changes of all metrics of the flows in both reports
+    :rtype: List[Change]
+    """
+    changes: List[Change] = []
+    for name, candidate_results in candidate.items():
+        baseline_results = baseline.get(name)
+        if baseline_results is None:
+            continue
+        changes.extend(
+            _compare_flow(
+                name, baseline_results, candidate_results, tolerances
+            )
+        )
+    return changes
+
+
+def _add_flow(flow_results: _FlowResults, flow: Dict[str, Any]) -> None:
+    flow_results.runs += 1
+    # NOTE: A flow can have multiple analysers which report the same
+    #       details. Take each of them only once.
+    counted = goodput_added = latency_added = mos_added = False
+    distribution_added = False
+    for analyser in flow.get('analysers') or []:
+        results = analyser.get('results') or {}
+        sent = results.get('source', {}).get('sent', {})
+        destination = results.get('destination', {})
+        received = destination.get('received', {})
+        if not counted and 'packets' in sent and 'packets' in received:
+            counted = True
+            flow_results.tx_packets += sent['packets']
+            flow_results.rx_packets += received['packets']
+        if not goodput_added and 'overTimeResults' in received:
+            goodput_added = True
+            flow_results.goodput.extend(
+                _interval_goodput(received['overTimeResults'])
+            )
+        latency = destination.get('latency')
+        if not latency_added and latency:
+            latency_added = True
+            for metric in _LATENCY_METRICS:
+                flow_results.add_scalar(
+                    'latency.' + metric, latency.get(metric)
+                )
+        # NOTE: Not all latency analysers have the latency distribution.
+        #       Take it from the first analyser which has one.
+        distribution = latency.get('distribution') if latency else None
+        if not distribution_added and distribution:
+            distribution_added = True
+            histogram = flow_results.latency_histogram
+            for bucket in distribution:
+                histogram[bucket['start']] = (
+                    histogram.get(bucket['start'], 0) + bucket['packets']
+                )
+        voice = destination.get('voice')
+        if not mos_added and voice and voice.get('mos') is not None:
+            mos_added = True
+            flow_results.add_scalar('mos', voice['mos'])
+
+
+def _interval_goodput(over_time_results: Any) -> List[float]:
+    """Return the received bitrate of each result interval."""
+    if isinstance(over_time_results, dict):
+        # Serialized DataFrame, by column (and index)
+        records = zip(
+            over_time_results.get('duration', {}).values(),
+            over_time_results.get('bytes', {}).values(),
+        )
+    else:
+        # Serialized DataFrame, by record
+        records = (
+            (record.get('duration'), record.get('bytes'))
+            for record in over_time_results or []
+        )
+    goodput: List[float] = []
+    for duration, received_bytes in records:
+        seconds = _seconds(duration)
+        if seconds and received_bytes is not None:
+            goodput.append(8 * received_bytes / seconds)
+    return goodput
+
+
+def _seconds(duration: Any) -> Optional[float]:
+    if duration is None:
+        return None
+    if isinstance(duration, (int, float)):
+        # pandas writes numeric durations in milliseconds by default
+        return duration / 1e3
+    match = _ISO_DURATION.match(duration)
+    if match is None:
+        return None
+    return (
+        int(match.group('days')) * 86400 + int(match.group('hours')) * 3600 +
+        int(match.group('minutes')) * 60 + float(match.group('seconds'))
+    )
+
+
+def _compare_flow(
+    name: str,
+    baseline: _FlowResults,
+    candidate: _FlowResults,
+    tolerances: Tolerances,
+) -> Iterable[Change]:
+    # Frame loss: two-proportion z-test on the pooled frame counts
+    if baseline.tx_packets and candidate.tx_packets:
+        baseline_lost = baseline.tx_packets - baseline.rx_packets
+        candidate_lost = candidate.tx_packets - candidate.rx_packets
+        baseline_loss = baseline_lost / baseline.tx_packets
+        candidate_loss = candidate_lost / candidate.tx_packets
+        p_value = _proportion_test(
+            baseline_lost,
+            baseline.tx_packets,
+            candidate_lost,
+            candidate.tx_packets,
+        )
+        yield Change(
+            name,
+            'loss',
+            baseline_loss,
+            candidate_loss,
+            p_value,
+            p_value < tolerances.alpha
+            and abs(candidate_loss - baseline_loss) >= tolerances.loss_change,
+            candidate_loss > baseline_loss,
+        )
+
+    # Latency distribution: Kolmogorov-Smirnov test on the histograms
+    if baseline.latency_histogram and candidate.latency_histogram:
+        distance, shift, p_value = _histogram_test(
+            baseline.latency_histogram, candidate.latency_histogram
+        )
+        yield Change(
+            name,
+            'latency.median',
+            _histogram_median(baseline.latency_histogram),
+            _histogram_median(candidate.latency_histogram),
+            p_value,
+            p_value < tolerances.alpha
+            and distance >= tolerances.distribution_distance,
+            shift > 0,
+        )
+
+    # Goodput: Mann-Whitney U test on the per-interval goodput
+    if baseline.goodput and candidate.goodput:
+        baseline_goodput = mean(baseline.goodput)
+        candidate_goodput = mean(candidate.goodput)
+        p_value = _mann_whitney_test(baseline.goodput, candidate.goodput)
+        yield Change(
+            name,
+            'goodput',
+            baseline_goodput,
+            candidate_goodput,
+            p_value,
+            p_value < tolerances.alpha
+            and _relative_change(baseline_goodput, candidate_goodput)
+            >= tolerances.relative_change,
+            candidate_goodput < baseline_goodput,
+        )
+
+    # Summary values: a single value per report
+    for metric, higher_is_worse in (
+        ('latency.average', True),
+        ('latency.jitter', True),
+        ('latency.maximum', True),
+        ('mos', False),
+    ):
+        baseline_values = baseline.scalars.get(metric)
+        candidate_values = candidate.scalars.get(metric)
+        if not baseline_values or not candidate_values:
+            continue
+        baseline_value = mean(baseline_values)
+        candidate_value = mean(candidate_values)
+        p_value = _outlier_test(baseline_values, candidate_value)
+        yield Change(
+            name,
+            metric,
+            baseline_value,
+            candidate_value,
+            p_value,
+            (p_value is None or p_value < tolerances.alpha)
+            and _relative_change(baseline_value, candidate_value)
+            >= tolerances.relative_change,
+            (candidate_value > baseline_value) == higher_is_worse,
+        )
+
+
+def _relative_change(baseline: float, candidate: float) -> float:
+    if baseline == 0:
+        return 0.0 if candidate == 0 else float('inf')
+    return abs(candidate - baseline) / abs(baseline)
+
+
+def _normal_p_value(z: float) -> float:
+    """Return the two-sided p-value of a standard normal z-score."""
+    return erfc(abs(z) / sqrt(2))
+
+
+def _proportion_test(
+    count_1: int, total_1: int, count_2: int, total_2: int
+) -> float:
+    """Two-proportion z-test, return the two-sided p-value."""
+    pooled = (count_1 + count_2) / (total_1 + total_2)
+    variance = pooled * (1 - pooled) * (1 / total_1 + 1 / total_2)
+    if variance <= 0:
+        return 1.0
+    z = (count_2 / total_2 - count_1 / total_1) / sqrt(variance)
+    return _normal_p_value(z)
+
+
+def _histogram_test(
+    histogram_1: Dict[float, int], histogram_2: Dict[float, int]
+) -> Tuple[float, float, float]:
+    """Two-sample Kolmogorov-Smirnov test on binned data.
+
+    :return: Kolmogorov-Smirnov distance, signed distance (positive when
+       the second sample has higher values) and the p-value
+    :rtype: Tuple[float, float, float]
+    """
+    total_1 = sum(histogram_1.values())
+    total_2 = sum(histogram_2.values())
+    if not total_1 or not total_2:
+        return 0.0, 0.0, 1.0
+    cumulative_1 = cumulative_2 = 0
+    shift = 0.0
+    for start in sorted(histogram_1.keys() | histogram_2.keys()):
+        cumulative_1 += histogram_1.get(start, 0)
+        cumulative_2 += histogram_2.get(start, 0)
+        # Positive when the second CDF is below the first one,
+        # which means higher values in the second sample
+        difference = cumulative_1 / total_1 - cumulative_2 / total_2
+        if abs(difference) > abs(shift):
+            shift = difference
+    distance = abs(shift)
+    effective_size = total_1 * total_2 / (total_1 + total_2)
+    return distance, shift, _kolmogorov_p_value(
+        distance * sqrt(effective_size)
+    )
+
+
+def _histogram_median(histogram: Dict[float, int]) -> float:
+    """Return the start of the latency bucket with the median."""
+    half = sum(histogram.values()) / 2
+    cumulative = 0
+    for start in sorted(histogram):
+        cumulative += histogram[start]
+        if cumulative >= half:
+            return start
+    return 0.0
+
+
+def _kolmogorov_p_value(statistic: float) -> float:
+    """Asymptotic p-value of the Kolmogorov distribution."""
+    if statistic < 0.2:
+        return 1.0
+    p_value = 2 * sum(
+        (-1)**(k - 1) * exp(-2 * k * k * statistic * statistic)
+        for k in range(1, 101)
+    )
+    return min(max(p_value, 0.0), 1.0)
+
+
+def _mann_whitney_test(
+    sample_1: Sequence[float], sample_2: Sequence[float]
+) -> float:
+    """Mann-Whitney U test (normal approximation), return the p-value."""
+    size_1 = len(sample_1)
+    size_2 = len(sample_2)
+    values = [(value, 0) for value in sample_1]
+    values.extend((value, 1) for value in sample_2)
+    values.sort()
+    # Rank sum of the first sample, with average ranks for ties
+    rank_sum_1 = 0.0
+    tie_correction = 0.0
+    index = 0
+    while index < len(values):
+        end = index
+        value = values[index][0]
+        while end + 1 < len(values) and values[end + 1][0] == value:
+            end += 1
+        ties = end - index + 1
+        rank = (index + end) / 2 + 1
+        rank_sum_1 += rank * sum(
+            1 for _, sample in values[index:end + 1] if sample == 0
+        )
+        tie_correction += ties**3 - ties
+        index = end + 1
+    u_1 = rank_sum_1 - size_1 * (size_1 + 1) / 2
+    total = size_1 + size_2
+    variance = size_1 * size_2 / 12 * (
+        total + 1 - tie_correction / (total * (total - 1))
+    ) if total > 1 else 0.0
+    if variance <= 0:
+        return 1.0
+    z = (u_1 - size_1 * size_2 / 2) / sqrt(variance)
+    return _normal_p_value(z)
+
+
+def _outlier_test(baseline_values: Sequence[float],
+                  candidate_value: float) -> Optional[float]:
+    """Test whether the candidate value fits the baseline runs.
+
+    :return: p-value of the z-score of the candidate value, ``None``
+       when the baseline has too few runs to estimate the variation
+    :rtype: Optional[float]
+    """
+    if len(baseline_values) < 2:
+        return None
+    deviation = stdev(baseline_values)
+    if deviation == 0:
+        return 0.0 if candidate_value != baseline_values[0] else 1.0
+    return _normal_p_value(
+        (candidate_value - mean(baseline_values)) / deviation
+    )
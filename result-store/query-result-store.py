@@ -0,0 +1,94 @@
+"""Query the historical results of ByteBlower test runs."""
+import logging  # Use the Python default logging interface
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from glob import iglob
+from os import getcwd
+from os.path import join
+from time import perf_counter
+
+from result_store import ResultStore  # Local result store
+
+# The generated reports are stored in the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+# The results of all runs are stored in this (SQLite) database.
+_RESULT_STORE = join(_REPORT_PATH, 'results.sqlite')
+
+
+def main() -> None:
+    """Ingest reports in or query the result store."""
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database',
+        default=_RESULT_STORE,
+        help='Location of the result store (default: %(default)s)',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser(
+        'ingest', help='Store (existing) ByteBlower JSON reports'
+    )
+    ingest.add_argument(
+        'pattern',
+        nargs='?',
+        default=join(_REPORT_PATH, '*.json'),
+        help='Report file name pattern (default: %(default)s)',
+    )
+
+    commands.add_parser('flows', help='List the stored flows')
+
+    metrics = commands.add_parser('metrics', help='List the stored metrics')
+    metrics.add_argument('--flow', help='Only list metrics of this flow')
+
+    trend = commands.add_parser(
+        'trend', help='Show the values of a metric over time'
+    )
+    trend.add_argument('flow', help='Name of the flow')
+    trend.add_argument(
+        'metric', help='Name of the metric, e.g. destination.latency.cdf.p99'
+    )
+    trend.add_argument('--port', help='Name of the source/destination port')
+    trend.add_argument(
+        '--days',
+        type=float,
+        help='Only show the results of the last DAYS days',
+    )
+
+    args = parser.parse_args()
+
+    with ResultStore(args.database) as result_store:
+        if args.command == 'ingest':
+            stored = result_store.add_reports(
+                sorted(iglob(args.pattern, recursive=True))
+            )
+            logging.info('Stored %d new report(s)', stored)
+        elif args.command == 'flows':
+            for flow in result_store.flows():
+                print(flow)
+        elif args.command == 'metrics':
+            for metric in result_store.metrics(flow=args.flow):
+                print(metric)
+        else:
+            since = None
+            if args.days is not None:
+                since = datetime.utcnow() - timedelta(days=args.days)
+            query_start = perf_counter()
+            results = result_store.trend(
+                args.flow, args.metric, port=args.port, since=since
+            )
+            query_duration = perf_counter() - query_start
+            for start_moment, analyser, value in results:
+                print(f'{start_moment}\t{analyser}\t{value:g}')
+            logging.info(
+                'Found %d result(s) in %.3f ms',
+                len(results),
+                query_duration * 1e3,
+            )
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    main()
@@ -0,0 +1,118 @@
+"""Re-evaluate stored results with other pass/fail criteria."""
+import logging  # Use the Python default logging interface
+from argparse import ArgumentParser
+from datetime import datetime, timedelta
+from os import getcwd
+from os.path import join
+from time import perf_counter
+
+from reanalysis import Reanalyser, Thresholds  # Offline re-analysis
+from result_store import ResultStore  # Local result store
+
+# The generated reports are stored in the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+# The results of all runs are stored in this (SQLite) database.
+_RESULT_STORE = join(_REPORT_PATH, 'results.sqlite')
+
+
+def _format_status(passed) -> str:
+    if passed is None:
+        return 'n/a'
+    return 'PASS' if passed else 'FAIL'
+
+
+def main() -> None:
+    """Re-analyse the stored results and show the (changed) verdicts."""
+    defaults = Thresholds()
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--database',
+        default=_RESULT_STORE,
+        help='Location of the result store (default: %(default)s)',
+    )
+    parser.add_argument('--flow', help='Only re-analyse this flow')
+    parser.add_argument(
+        '--days',
+        type=float,
+        help='Only re-analyse the results of the last DAYS days',
+    )
+    parser.add_argument(
+        '--max-loss-percentage',
+        type=float,
+        default=defaults.max_loss_percentage,
+        help='Maximum allowed frame loss in %% (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--max-threshold-latency',
+        type=float,
+        default=defaults.max_threshold_latency,
+        help='Maximum allowed latency in ms (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--quantile',
+        type=float,
+        default=defaults.quantile,
+        help='Latency CDF quantile (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--minimum-mos',
+        type=float,
+        default=defaults.minimum_mos,
+        help='Minimum required MOS (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--changed',
+        action='store_true',
+        help='Only show verdicts which differ from the original report',
+    )
+    args = parser.parse_args()
+
+    thresholds = Thresholds(
+        max_loss_percentage=args.max_loss_percentage,
+        max_threshold_latency=args.max_threshold_latency,
+        quantile=args.quantile,
+        minimum_mos=args.minimum_mos,
+    )
+    since = None
+    if args.days is not None:
+        since = datetime.utcnow() - timedelta(days=args.days)
+
+    analysed = 0
+    recomputed = 0
+    changed = 0
+    start = perf_counter()
+    with ResultStore(args.database) as result_store:
+        reanalyser = Reanalyser(result_store, thresholds)
+        for reanalysis in reanalyser.run(flow=args.flow, since=since):
+            analysed += 1
+            if not reanalysis.cached:
+                recomputed += 1
+            is_changed = reanalysis.passed != reanalysis.original_passed
+            if is_changed:
+                changed += 1
+            elif args.changed:
+                continue
+            print(
+                f'{reanalysis.start_moment}\t{reanalysis.flow}'
+                f'\t{reanalysis.analyser}'
+                f'\t{_format_status(reanalysis.original_passed)}'
+                f' -> {_format_status(reanalysis.passed)}'
+                f'\t{"; ".join(reanalysis.failure_causes)}'
+            )
+    logging.info(
+        'Re-analysed %d analyser result(s) in %.3f s'
+        ' (%d recomputed, %d from cache), %d changed verdict(s)',
+        analysed,
+        perf_counter() - start,
+        recomputed,
+        analysed - recomputed,
+        changed,
+    )
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    main()
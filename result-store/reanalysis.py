@@ -0,0 +1,264 @@
+"""Offline re-analysis of stored results with other pass/fail criteria."""
+from dataclasses import dataclass
+from datetime import datetime  # for type hinting
+from typing import (  # for type hinting
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from result_store import AnalyserResult, ResultStore
+
+# Analyser types (as reported in the JSON report)
+_FRAME_LOSS_ANALYSER = 'Frame loss analyser'
+_LATENCY_ANALYSER = 'Frame latency and loss analyser'
+_LATENCY_CDF_ANALYSER = 'Frame latency CDF and loss analyser'
+_VOICE_ANALYSER = 'VoIP Analyser'
+
+_CDF_METRIC_PREFIX = 'destination.latency.cdf.p'
+
+
+@dataclass(frozen=True)
+class Thresholds(object):
+    """Pass/fail criteria of the analysers.
+
+    The defaults are the defaults of the ByteBlower Test Framework.
+    """
+
+    #: Maximum allowed packet and byte loss in %.
+    #: Used by frame loss and latency analysers.
+    max_loss_percentage: float = 1.0
+    #: Maximum allowed latency in milliseconds.
+    #: Used by latency analysers.
+    max_threshold_latency: float = 5.0
+    #: Quantile for which the latency must be less than
+    #: ``max_threshold_latency``. Used by latency CDF analysers.
+    quantile: float = 99.9
+    #: Minimum required Mean Opinion Score. Used by voice analysers.
+    minimum_mos: float = 4.0
+
+
+# Thresholds which affect the verdict of each analyser type.
+_ANALYSER_THRESHOLDS: Dict[str, Tuple[str, ...]] = {
+    _FRAME_LOSS_ANALYSER: ('max_loss_percentage', ),
+    _LATENCY_ANALYSER: ('max_loss_percentage', 'max_threshold_latency'),
+    _LATENCY_CDF_ANALYSER: (
+        'max_loss_percentage',
+        'max_threshold_latency',
+        'quantile',
+    ),
+    _VOICE_ANALYSER: ('minimum_mos', ),
+}
+
+
+class Reanalysis(NamedTuple):
+    """Verdict of a flow analyser for new pass/fail criteria."""
+
+    #: Start time of the test run
+    start_moment: Optional[str]
+    #: Name of the flow
+    flow: str
+    #: Analyser type
+    analyser: str
+    #: Test status in the original report
+    original_passed: Optional[bool]
+    #: Test status for the new criteria
+    passed: Optional[bool]
+    #: Failure causes for the new criteria
+    failure_causes: List[str]
+    #: Whether the verdict was taken from the result store cache
+    cached: bool
+
+
+class Reanalyser(object):
+    """Re-evaluate the verdicts of stored analyser results.
+
+    The verdicts are calculated from the metrics in the
+    :class:`ResultStore`, no traffic needs to be sent.
+
+    Only the analysers for which relevant thresholds differ from previously
+    evaluated criteria are recomputed. All other verdicts are taken from
+    the result store, where new verdicts are cached as well.
+
+    .. note::
+       The latency CDF verdict is evaluated from the stored latency
+       percentiles. These were calculated over the latency range of the
+       original run (``[0, 50 * max_threshold_latency[``).
+    """
+
+    __slots__ = (
+        '_result_store',
+        '_thresholds',
+    )
+
+    def __init__(
+        self, result_store: ResultStore, thresholds: Thresholds
+    ) -> None:
+        """Create a re-analyser for the given pass/fail criteria.
+
+        :param result_store: Store with the results of the test runs
+        :type result_store: ResultStore
+        :param thresholds: New pass/fail criteria
+        :type thresholds: Thresholds
+        """
+        self._result_store = result_store
+        self._thresholds = thresholds
+
+    def run(
+        self,
+        flow: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> Iterator[Reanalysis]:
+        """Generate the verdicts for all (supported) stored analysers.
+
+        :param flow: Only re-analyse this flow, defaults to ``None``
+        :type flow: Optional[str], optional
+        :param since: Only re-analyse runs which started at or after
+           this (UTC) time, defaults to ``None``
+        :type since: Optional[datetime], optional
+        :return: New analyser verdicts, ordered by run start time.
+        :rtype: Iterator[Reanalysis]
+        """
+        result_store = self._result_store
+        for result in result_store.analyser_results(flow=flow, since=since):
+            criteria = self._criteria(result.analyser)
+            if criteria is None:
+                # Unsupported analyser type
+                continue
+            original = result_store.verdict(
+                result.flow_id, result.analyser_index
+            )
+            original_passed = original[0] if original else None
+
+            verdict = result_store.verdict(
+                result.flow_id, result.analyser_index, criteria
+            )
+            cached = verdict is not None
+            if verdict is None:
+                verdict = self._evaluate(result)
+                result_store.add_verdict(
+                    result.flow_id,
+                    result.analyser_index,
+                    result.analyser,
+                    criteria,
+                    *verdict,
+                )
+            passed, failure_causes = verdict
+            yield Reanalysis(
+                result.start_moment,
+                result.flow,
+                result.analyser,
+                original_passed,
+                passed,
+                failure_causes,
+                cached,
+            )
+
+    def _criteria(self, analyser: str) -> Optional[str]:
+        """Return the fingerprint of the thresholds used by the analyser."""
+        threshold_names = _ANALYSER_THRESHOLDS.get(analyser)
+        if threshold_names is None:
+            return None
+        return ','.join(
+            f'{name}={getattr(self._thresholds, name)!r}'
+            for name in threshold_names
+        )
+
+    def _evaluate(self,
+                  result: AnalyserResult) -> Tuple[Optional[bool], List[str]]:
+        failure_causes: List[str] = []
+        metrics = result.metrics
+        thresholds = self._thresholds
+        threshold_names = _ANALYSER_THRESHOLDS[result.analyser]
+
+        if 'max_loss_percentage' in threshold_names:
+            failure_causes.extend(_check_loss(metrics, thresholds))
+        if 'quantile' in threshold_names:
+            failure_causes.extend(_check_quantile(metrics, thresholds))
+        # NOTE: The latency CDF analyser only checks the latency
+        #       at the quantile, not the maximum latency.
+        if result.analyser == _LATENCY_ANALYSER:
+            failure_causes.extend(_check_latency(metrics, thresholds))
+        if 'minimum_mos' in threshold_names:
+            failure_causes.extend(_check_mos(metrics, thresholds))
+
+        return not failure_causes, failure_causes
+
+
+def _check_loss(metrics: Dict[str, float],
+                thresholds: Thresholds) -> List[str]:
+    tx_packets = metrics.get('source.sent.packets', 0)
+    rx_packets = metrics.get('destination.received.packets', 0)
+    tx_bytes = metrics.get('source.sent.bytes', 0)
+    rx_bytes = metrics.get('destination.received.bytes', 0)
+
+    relative_packet_loss = 100.0
+    if tx_packets:
+        relative_packet_loss *= (tx_packets - rx_packets) / tx_packets
+    relative_byte_loss = 100.0
+    if tx_bytes:
+        relative_byte_loss *= (tx_bytes - rx_bytes) / tx_bytes
+
+    if relative_packet_loss > thresholds.max_loss_percentage:
+        return [
+            'Packet loss has exceeded the maximum allowed'
+            f' loss of {thresholds.max_loss_percentage:0.2f} %'
+        ]
+    if relative_byte_loss > thresholds.max_loss_percentage:
+        return [
+            'Byte loss has exceeded the maximum allowed loss'
+            f' of {thresholds.max_loss_percentage:0.2f} %'
+        ]
+    return []
+
+
+def _check_latency(metrics: Dict[str, float],
+                   thresholds: Thresholds) -> List[str]:
+    maximum_latency = metrics.get('destination.latency.maximum')
+    if maximum_latency is None:
+        return ['No latency related data received']
+    if maximum_latency > thresholds.max_threshold_latency:
+        return [
+            'Latency has exceeded the maximum allowed latency'
+            f' of {thresholds.max_threshold_latency:0.2f} ms'
+        ]
+    return []
+
+
+def _check_quantile(metrics: Dict[str, float],
+                    thresholds: Thresholds) -> List[str]:
+    percentiles = sorted(
+        (float(name[len(_CDF_METRIC_PREFIX):]), latency)
+        for name, latency in metrics.items()
+        if name.startswith(_CDF_METRIC_PREFIX)
+    )
+    for percentile, latency in percentiles:
+        if percentile > thresholds.quantile:
+            break
+        if latency > thresholds.max_threshold_latency:
+            return [
+                'Latency is larger'
+                f' than {thresholds.max_threshold_latency} ms'
+                f' for quantile {percentile:g}'
+            ]
+    return []
+
+
+def _check_mos(metrics: Dict[str, float], thresholds: Thresholds) -> List[str]:
+    if not metrics.get('destination.received.bytes'):
+        return ['No packets received. MOS calculation is skipped.']
+    mos = metrics.get('destination.voice.mos')
+    if mos is None:
+        return [
+            'No packets received with valid latency tag.'
+            ' MOS calculation is skipped.'
+        ]
+    if mos < thresholds.minimum_mos:
+        return [
+            'Audio quality is less then desired'
+            ' minimum Mean Opinion Score (MOS)'
+        ]
+    return []
@@ -0,0 +1,500 @@
+"""Indexed result store for ByteBlower JSON reports."""
+import json
+import logging
+import re
+import sqlite3
+from datetime import datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+from typing import (  # for type hinting
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Result details which contain (large) series instead of summary values.
+# These are not stored as metrics.
+_SKIPPED_DETAILS = ('overTimeResults', 'distribution')
+
+_ISO_MOMENT = re.compile(
+    r'(?P<moment>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})'
+    r'(?P<fraction>\.\d+)?(?P<offset>Z|[+-]\d{2}:\d{2})?$'
+)
+
+
+class AnalyserResult(NamedTuple):
+    """Stored metrics of a single flow analyser."""
+
+    #: Identifier of the stored flow
+    flow_id: int
+    #: Start time of the test run
+    start_moment: Optional[str]
+    #: Name of the flow
+    flow: str
+    #: Position of the analyser in the flow
+    analyser_index: int
+    #: Analyser type
+    analyser: str
+    #: Metric values, by metric name
+    metrics: Dict[str, float]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS run (
+    id INTEGER PRIMARY KEY,
+    report TEXT NOT NULL UNIQUE,
+    start_moment TEXT,
+    end_moment TEXT,
+    passed INTEGER,
+    framework_version TEXT
+);
+CREATE TABLE IF NOT EXISTS flow (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES run (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    type TEXT,
+    source TEXT,
+    destination TEXT,
+    passed INTEGER
+);
+CREATE TABLE IF NOT EXISTS metric (
+    flow_id INTEGER NOT NULL REFERENCES flow (id) ON DELETE CASCADE,
+    analyser_index INTEGER NOT NULL,
+    analyser TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verdict (
+    flow_id INTEGER NOT NULL REFERENCES flow (id) ON DELETE CASCADE,
+    analyser_index INTEGER NOT NULL,
+    analyser TEXT NOT NULL,
+    criteria TEXT NOT NULL,
+    passed INTEGER,
+    failure_causes TEXT NOT NULL,
+    PRIMARY KEY (flow_id, analyser_index, criteria)
+);
+CREATE INDEX IF NOT EXISTS run_start_moment ON run (start_moment);
+CREATE INDEX IF NOT EXISTS flow_name ON flow (name, run_id);
+CREATE INDEX IF NOT EXISTS flow_source ON flow (source);
+CREATE INDEX IF NOT EXISTS flow_destination ON flow (destination);
+CREATE INDEX IF NOT EXISTS metric_name ON metric (name, flow_id);
+CREATE INDEX IF NOT EXISTS metric_flow ON metric (flow_id);
+"""
+
+
+class ResultStore(object):
+    """Local SQLite store for the results of ByteBlower test runs.
+
+    Every :class:`ByteBlowerJsonReport` which is added to the store is
+    split in test *runs*, *flows* and (summary) *metrics*. Flow names,
+    port names, run start time and metric names are indexed, so trend
+    queries over many runs do not need to read the original reports.
+
+    The metric names are the dotted path to the value in the analyser
+    results, for example ``destination.latency.average``. Latency
+    percentiles (from the latency CDF analysers) are stored as
+    ``destination.latency.cdf.p<percentile>``. The frame loss ratio is
+    derived and stored as ``destination.received.lossRatio``.
+
+    The analysers of a flow are identified by their position in the flow,
+    so a flow can have multiple analysers of the same type.
+
+    Next to the metrics, the store keeps the analyser *verdicts*.
+    The verdicts from the original report are stored with empty
+    ``criteria``. Verdicts for other pass/fail criteria can be added
+    afterwards, for example after re-analysis of the stored results.
+    """
+
+    __slots__ = ('_connection', )
+
+    def __init__(self, database: str) -> None:
+        """Open (or create) a result store.
+
+        :param database: Location of the SQLite database file
+        :type database: str
+        """
+        self._connection = sqlite3.connect(database)
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self._connection.close()
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add_report(self, report: str) -> Optional[int]:
+        """Store the results of a ByteBlower JSON report.
+
+        Reports which were stored before are skipped.
+
+        :param report: Location of the JSON report file
+        :type report: str
+        :return: Identifier of the stored run, ``None`` when the report
+           was already stored.
+        :rtype: Optional[int]
+        """
+        if self._run_id(report) is not None:
+            logging.debug('Report %r is already stored', report)
+            return None
+        with open(report, 'r', encoding='utf-8') as report_file:
+            content = json.load(report_file)
+        return self.add_content(report, content)
+
+    def add_content(self, report: str, content: Dict[str, Any]) -> int:
+        """Store the (parsed) content of a ByteBlower JSON report.
+
+        :param report: Unique name for the report, typically its location
+        :type report: str
+        :param content: Parsed content of the JSON report
+        :type content: Dict[str, Any]
+        :return: Identifier of the stored run
+        :rtype: int
+        """
+        status = (content.get('summary') or {}).get('status') or {}
+        with self._connection:
+            cursor = self._connection.execute(
+                'INSERT INTO run'
+                ' (report, start_moment, end_moment, passed,'
+                ' framework_version)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (
+                    report,
+                    _normalize_moment(content.get('startMoment')),
+                    _normalize_moment(content.get('endMoment')),
+                    status.get('passed'),
+                    content.get('testFrameworkVersion'),
+                ),
+            )
+            run_id = cursor.lastrowid
+            for flow in content.get('flows') or []:
+                self._add_flow(run_id, flow)
+        return run_id
+
+    def add_reports(self, reports: Iterable[str]) -> int:
+        """Store the results of multiple ByteBlower JSON reports.
+
+        :param reports: Locations of the JSON report files
+        :type reports: Iterable[str]
+        :return: Number of newly stored runs
+        :rtype: int
+        """
+        stored = 0
+        for report in reports:
+            try:
+                run_id = self.add_report(report)
+            except (OSError, ValueError):
+                logging.warning(
+                    'Failed to store report %r', report, exc_info=True
+                )
+                continue
+            if run_id is not None:
+                stored += 1
+        return stored
+
+    def trend(
+        self,
+        flow: str,
+        metric: str,
+        port: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Tuple[str, str, float]]:
+        """Return the values of a metric for a flow over all stored runs.
+
+        For example: ``destination.latency.cdf.p99`` of the
+        ``Upstream UDP flow`` on port ``CPE`` over the last 30 days.
+
+        :param flow: Name of the flow
+        :type flow: str
+        :param metric: Name of the metric
+        :type metric: str
+        :param port: Only return results for flows which have this
+           port or endpoint as source or destination, defaults to ``None``
+        :type port: Optional[str], optional
+        :param since: Only return results of runs which started at or after
+           this (UTC) time, defaults to ``None``
+        :type since: Optional[datetime], optional
+        :param until: Only return results of runs which started before
+           this (UTC) time, defaults to ``None``
+        :type until: Optional[datetime], optional
+        :return: Run start time, analyser type and metric value,
+           ordered by run start time.
+        :rtype: List[Tuple[str, str, float]]
+        """
+        query = (
+            'SELECT run.start_moment, metric.analyser, metric.value'
+            ' FROM metric'
+            ' JOIN flow ON flow.id = metric.flow_id'
+            ' JOIN run ON run.id = flow.run_id'
+            ' WHERE metric.name = ? AND flow.name = ?'
+        )
+        parameters: List[Any] = [metric, flow]
+        if port is not None:
+            query += ' AND (flow.source = ? OR flow.destination = ?)'
+            parameters.extend((port, port))
+        if since is not None:
+            query += ' AND run.start_moment >= ?'
+            parameters.append(_format_moment(since))
+        if until is not None:
+            query += ' AND run.start_moment < ?'
+            parameters.append(_format_moment(until))
+        query += ' ORDER BY run.start_moment'
+        return self._connection.execute(query, parameters).fetchall()
+
+    def flows(self) -> List[str]:
+        """Return the names of all stored flows."""
+        rows = self._connection.execute(
+            'SELECT DISTINCT name FROM flow ORDER BY name'
+        )
+        return [name for (name, ) in rows]
+
+    def metrics(self, flow: Optional[str] = None) -> List[str]:
+        """Return the names of all stored metrics.
+
+        :param flow: Only return the metrics of this flow,
+           defaults to ``None``
+        :type flow: Optional[str], optional
+        """
+        if flow is None:
+            cursor = self._connection.execute(
+                'SELECT DISTINCT name FROM metric ORDER BY name'
+            )
+        else:
+            cursor = self._connection.execute(
+                'SELECT DISTINCT metric.name FROM metric'
+                ' JOIN flow ON flow.id = metric.flow_id'
+                ' WHERE flow.name = ? ORDER BY metric.name',
+                (flow, ),
+            )
+        return [name for (name, ) in cursor]
+
+    def analyser_results(
+        self,
+        flow: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> Iterator[AnalyserResult]:
+        """Generate the stored metrics per flow analyser.
+
+        :param flow: Only return results of this flow, defaults to ``None``
+        :type flow: Optional[str], optional
+        :param since: Only return results of runs which started at or after
+           this (UTC) time, defaults to ``None``
+        :type since: Optional[datetime], optional
+        :return: Analyser results, ordered by run start time.
+        :rtype: Iterator[AnalyserResult]
+        """
+        query = (
+            'SELECT metric.flow_id, run.start_moment, flow.name,'
+            ' metric.analyser_index, metric.analyser, metric.name,'
+            ' metric.value'
+            ' FROM metric'
+            ' JOIN flow ON flow.id = metric.flow_id'
+            ' JOIN run ON run.id = flow.run_id'
+            ' WHERE 1'
+        )
+        parameters: List[Any] = []
+        if flow is not None:
+            query += ' AND flow.name = ?'
+            parameters.append(flow)
+        if since is not None:
+            query += ' AND run.start_moment >= ?'
+            parameters.append(_format_moment(since))
+        query += (
+            ' ORDER BY run.start_moment, metric.flow_id,'
+            ' metric.analyser_index'
+        )
+        cursor = self._connection.execute(query, parameters)
+        for key, rows in groupby(cursor, key=itemgetter(0, 1, 2, 3, 4)):
+            metrics = {name: value for *_, name, value in rows}
+            yield AnalyserResult(*key, metrics)
+
+    def verdict(
+        self,
+        flow_id: int,
+        analyser_index: int,
+        criteria: str = '',
+    ) -> Optional[Tuple[Optional[bool], List[str]]]:
+        """Return a stored analyser verdict.
+
+        :param flow_id: Identifier of the stored flow
+        :type flow_id: int
+        :param analyser_index: Position of the analyser in the flow
+        :type analyser_index: int
+        :param criteria: Pass/fail criteria of the verdict,
+           defaults to the criteria of the original report
+        :type criteria: str, optional
+        :return: Test status and failure causes,
+           ``None`` when no verdict is stored for these criteria.
+        :rtype: Optional[Tuple[Optional[bool], List[str]]]
+        """
+        row = self._connection.execute(
+            'SELECT passed, failure_causes FROM verdict'
+            ' WHERE flow_id = ? AND analyser_index = ? AND criteria = ?',
+            (flow_id, analyser_index, criteria),
+        ).fetchone()
+        if row is None:
+            return None
+        passed, failure_causes = row
+        if passed is not None:
+            passed = bool(passed)
+        return passed, json.loads(failure_causes)
+
+    def add_verdict(
+        self,
+        flow_id: int,
+        analyser_index: int,
+        analyser: str,
+        criteria: str,
+        passed: Optional[bool],
+        failure_causes: Sequence[str],
+    ) -> None:
+        """Store an analyser verdict for the given pass/fail criteria.
+
+        :param flow_id: Identifier of the stored flow
+        :type flow_id: int
+        :param analyser_index: Position of the analyser in the flow
+        :type analyser_index: int
+        :param analyser: Analyser type
+        :type analyser: str
+        :param criteria: Pass/fail criteria of the verdict
+        :type criteria: str
+        :param passed: Test status
+        :type passed: Optional[bool]
+        :param failure_causes: Failure causes
+        :type failure_causes: Sequence[str]
+        """
+        with self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO verdict'
+                ' (flow_id, analyser_index, analyser, criteria, passed,'
+                ' failure_causes)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    flow_id,
+                    analyser_index,
+                    analyser,
+                    criteria,
+                    passed,
+                    json.dumps(list(failure_causes)),
+                ),
+            )
+
+    def _run_id(self, report: str) -> Optional[int]:
+        row = self._connection.execute(
+            'SELECT id FROM run WHERE report = ?', (report, )
+        ).fetchone()
+        return row[0] if row else None
+
+    def _add_flow(self, run_id: int, flow: Dict[str, Any]) -> None:
+        cursor = self._connection.execute(
+            'INSERT INTO flow'
+            ' (run_id, name, type, source, destination, passed)'
+            ' VALUES (?, ?, ?, ?, ?, ?)',
+            (
+                run_id,
+                flow.get('name'),
+                flow.get('type'),
+                (flow.get('source') or {}).get('name'),
+                (flow.get('destination') or {}).get('name'),
+                (flow.get('status') or {}).get('passed'),
+            ),
+        )
+        flow_id = cursor.lastrowid
+        analysers = flow.get('analysers') or []
+        for analyser_index, analyser in enumerate(analysers):
+            analyser_type = analyser.get('type')
+            status = analyser.get('status') or {}
+            self._connection.execute(
+                'INSERT INTO verdict'
+                ' (flow_id, analyser_index, analyser, criteria, passed,'
+                ' failure_causes)'
+                " VALUES (?, ?, ?, '', ?, ?)",
+                (
+                    flow_id,
+                    analyser_index,
+                    analyser_type,
+                    status.get('passed'),
+                    json.dumps(status.get('failure_causes') or []),
+                ),
+            )
+            self._connection.executemany(
+                'INSERT INTO metric'
+                ' (flow_id, analyser_index, analyser, name, value)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (
+                    (flow_id, analyser_index, analyser_type, name, value)
+                    for name, value in
+                    _flatten_results(analyser.get('results') or {})
+                ),
+            )
+
+
+def _flatten_results(
+    results: Dict[str, Any],
+    prefix: str = '',
+) -> Iterator[Tuple[str, float]]:
+    """Generate the (dotted) metric names and values of analyser results."""
+    for key, value in results.items():
+        if key in _SKIPPED_DETAILS:
+            continue
+        name = prefix + key
+        if isinstance(value, dict):
+            yield from _flatten_results(value, prefix=name + '.')
+        elif key == 'cdf' and isinstance(value, list):
+            for record in value:
+                yield (
+                    '{}.p{:g}'.format(name, record['percentile']),
+                    float(record['latency']),
+                )
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, float(value)
+
+    if not prefix:
+        # Derived frame loss ratio
+        try:
+            tx_packets = results['source']['sent']['packets']
+            rx_packets = results['destination']['received']['packets']
+        except (KeyError, TypeError):
+            return
+        if tx_packets:
+            yield (
+                'destination.received.lossRatio',
+                (tx_packets - rx_packets) / tx_packets,
+            )
+
+
+def _normalize_moment(moment: Optional[str]) -> Optional[str]:
+    """Normalize an ISO timestamp so it sorts correctly as text."""
+    if moment is None:
+        return None
+    # NOTE: ``datetime.fromisoformat`` does not support the trailing 'Z'
+    #       nor nanosecond resolution on older Python versions.
+    match = _ISO_MOMENT.match(moment)
+    if match is None:
+        raise ValueError(f'Invalid timestamp: {moment!r}')
+    fraction = match.group('fraction')
+    if fraction:
+        fraction = fraction[:7].ljust(7, '0')
+    timestamp = datetime.fromisoformat(
+        match.group('moment') + (fraction or '') +
+        (match.group('offset') or '').replace('Z', '+00:00')
+    )
+    return _format_moment(timestamp)
+
+
+def _format_moment(timestamp: datetime) -> str:
+    """Return the UTC ISO timestamp as stored in the database."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp.isoformat(timespec='milliseconds')
@@ -0,0 +1,101 @@
+"""Tests for the offline re-analysis of stored results."""
+import unittest
+from typing import Any, Dict  # for type hinting
+
+from reanalysis import Reanalyser, Thresholds
+from result_store import ResultStore
+
+# Latency percentiles of a latency CDF analyser which passed:
+# 99.9% of the frames are below the maximum latency threshold (5 ms),
+# only the maximum latency itself is above it.
+_LATENCY_CDF = [(90, 1.5), (99, 3.0), (99.9, 4.5)]
+_MAXIMUM_LATENCY = 7.5
+
+
+def _cdf_report() -> Dict[str, Any]:
+    """Return the JSON report content of a flow with a CDF analyser."""
+    cdf = [
+        {
+            'percentile': percentile,
+            'latency': value
+        } for percentile, value in _LATENCY_CDF
+    ]
+    latency = {
+        'minimum': 0.5,
+        'maximum': _MAXIMUM_LATENCY,
+        'average': 1.0,
+        'cdf': cdf,
+    }
+    analyser = {
+        'type': 'Frame latency CDF and loss analyser',
+        'status': {
+            'passed': True,
+            'failure_causes': []
+        },
+        'results': {
+            'source': {
+                'sent': {
+                    'packets': 10000,
+                    'bytes': 640000
+                }
+            },
+            'destination': {
+                'received': {
+                    'packets': 10000,
+                    'bytes': 640000
+                },
+                'latency': latency,
+            },
+        },
+    }
+    flow = {
+        'name': 'Downstream UDP flow',
+        'source': {
+            'name': 'WAN'
+        },
+        'destination': {
+            'name': 'CPE'
+        },
+        'status': {
+            'passed': True
+        },
+        'analysers': [analyser],
+    }
+    return {'startMoment': '2024-01-01T00:00:00Z', 'flows': [flow]}
+
+
+class ReanalyserTestCase(unittest.TestCase):
+    """Re-analysis of stored analyser results."""
+
+    def setUp(self) -> None:
+        self.result_store = ResultStore(':memory:')
+        self.result_store.add_content('report.json', _cdf_report())
+
+    def tearDown(self) -> None:
+        self.result_store.close()
+
+    def test_cdf_verdict_with_original_thresholds(self) -> None:
+        """Keep the original latency CDF verdict."""
+        reanalyser = Reanalyser(self.result_store, Thresholds())
+        reanalyses = list(reanalyser.run())
+        self.assertEqual(len(reanalyses), 1)
+        reanalysis = reanalyses[0]
+        self.assertIs(reanalysis.original_passed, True)
+        self.assertIs(reanalysis.passed, True)
+        self.assertEqual(reanalysis.failure_causes, [])
+
+    def test_cdf_verdict_with_lower_latency_threshold(self) -> None:
+        """Fail the latency CDF verdict only on the quantile latency."""
+        reanalyser = Reanalyser(
+            self.result_store, Thresholds(max_threshold_latency=4.0)
+        )
+        reanalysis, = reanalyser.run()
+        self.assertIs(reanalysis.passed, False)
+        self.assertEqual(
+            reanalysis.failure_causes,
+            ['Latency is larger than 4.0 ms for quantile 99.9'],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
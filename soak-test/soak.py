@@ -0,0 +1,242 @@
+"""Soak test in segments, with checkpointing and crash recovery."""
+import json
+import logging
+from datetime import datetime, timedelta
+from math import ceil
+from os import replace
+from os.path import isfile
+from typing import Any, Callable, Dict, List, Optional  # for type hinting
+
+# Checkpoint file format version
+_CHECKPOINT_VERSION = 1
+
+
+class SoakTest(object):
+    """Long-running test, run as a sequence of shorter segments.
+
+    Each segment is a separate scenario run. After every segment,
+    a compact summary of its results is stored in the checkpoint file.
+
+    When the test is interrupted (for example because the test controller
+    crashed), it continues with the next segment when it is started again
+    with the same checkpoint file. At most the results of the interrupted
+    segment are lost. The summary of all segments which are finished so far
+    is always available, see :meth:`summary`.
+    """
+
+    __slots__ = (
+        '_checkpoint_path',
+        '_checkpoint',
+    )
+
+    def __init__(
+        self,
+        checkpoint_path: str,
+        duration: timedelta,
+        segment_duration: timedelta,
+    ) -> None:
+        """Create a new soak test or resume it from its checkpoint.
+
+        :param checkpoint_path: Location of the checkpoint file
+        :type checkpoint_path: str
+        :param duration: Total traffic duration of the soak test
+        :type duration: timedelta
+        :param segment_duration: Traffic duration of a single segment
+        :type segment_duration: timedelta
+        :raises ValueError: When the checkpoint has another duration or
+           segment duration
+        """
+        self._checkpoint_path = checkpoint_path
+        if isfile(checkpoint_path):
+            with open(checkpoint_path, 'r', encoding='utf-8') as checkpoint:
+                self._checkpoint: Dict[str, Any] = json.load(checkpoint)
+            # NOTE: Segments of different lengths can not be combined
+            #       in a single summary.
+            if (self._checkpoint['duration'] != duration.total_seconds()
+                    or self._checkpoint['segmentDuration']
+                    != segment_duration.total_seconds()):
+                raise ValueError(
+                    'Soak test configuration of checkpoint'
+                    f' {checkpoint_path!r} differs from this run.'
+                    ' Remove the checkpoint to start a new soak test.'
+                )
+            logging.info(
+                'Resuming soak test from checkpoint %r'
+                ' (%d of %d segment(s) finished)',
+                checkpoint_path,
+                self.finished_segments,
+                self.number_of_segments,
+            )
+        else:
+            self._checkpoint = {
+                'version': _CHECKPOINT_VERSION,
+                'startMoment': datetime.utcnow().isoformat(),
+                'duration': duration.total_seconds(),
+                'segmentDuration': segment_duration.total_seconds(),
+                'segments': [],
+            }
+
+    @property
+    def number_of_segments(self) -> int:
+        """Return the total number of segments of the soak test."""
+        return ceil(
+            self._checkpoint['duration'] / self._checkpoint['segmentDuration']
+        )
+
+    @property
+    def finished_segments(self) -> int:
+        """Return the number of segments which are finished."""
+        return len(self._checkpoint['segments'])
+
+    @property
+    def finished(self) -> bool:
+        """Return whether all segments are finished."""
+        return self.finished_segments >= self.number_of_segments
+
+    def run(self, run_segment: Callable[[int, timedelta], str]) -> None:
+        """Run the remaining segments of the soak test.
+
+        :param run_segment: Runs a single segment: creates and runs the
+           scenario for the given segment index and traffic duration.
+           Returns the location of the ByteBlower JSON report
+           of the segment.
+        :type run_segment: Callable[[int, timedelta], str]
+        """
+        # NOTE: The checkpoint is only created when the test runs.
+        self._save()
+        duration = self._checkpoint['duration']
+        segment_duration = self._checkpoint['segmentDuration']
+        for index in range(self.finished_segments, self.number_of_segments):
+            traffic_duration = timedelta(
+                seconds=min(
+                    segment_duration, duration - index * segment_duration
+                )
+            )
+            logging.info(
+                'Running soak test segment %d of %d (%s)',
+                index + 1,
+                self.number_of_segments,
+                traffic_duration,
+            )
+            start_moment = datetime.utcnow()
+            report_url = run_segment(index, traffic_duration)
+            self._add_segment(start_moment, report_url)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the summary of the finished segments.
+
+        A flow only passed when it passed in all segments. A segment in
+        which the flow was not analysed (no test status) is listed in its
+        ``unanalysedSegments`` and does not count as passed.
+        The soak test only passed when there are results of flows
+        and all flows passed.
+
+        :return: Summary of the soak test, with the totals of each flow
+        :rtype: Dict[str, Any]
+        """
+        flows: Dict[str, Dict[str, Any]] = {}
+        for index, segment in enumerate(self._checkpoint['segments']):
+            for name, result in segment['flows'].items():
+                flow = flows.setdefault(
+                    name, {
+                        'segments': 0,
+                        'failedSegments': [],
+                        'unanalysedSegments': [],
+                        'txPackets': 0,
+                        'rxPackets': 0,
+                        'minimumMos': None,
+                        'maximumLatency': None,
+                    }
+                )
+                flow['segments'] += 1
+                if result['passed'] is None:
+                    flow['unanalysedSegments'].append(index)
+                elif not result['passed']:
+                    flow['failedSegments'].append(index)
+                flow['txPackets'] += result['txPackets'] or 0
+                flow['rxPackets'] += result['rxPackets'] or 0
+                flow['minimumMos'] = _minimum(
+                    flow['minimumMos'], result['mos']
+                )
+                flow['maximumLatency'] = _maximum(
+                    flow['maximumLatency'], result['maximumLatency']
+                )
+        for flow in flows.values():
+            if flow['txPackets']:
+                flow['lossPercentage'] = 100.0 * (
+                    flow['txPackets'] - flow['rxPackets']
+                ) / flow['txPackets']
+            flow['passed'] = not (
+                flow['failedSegments'] or flow['unanalysedSegments']
+            )
+        passed = bool(flows) and all(flow['passed'] for flow in flows.values())
+        return {
+            'startMoment': self._checkpoint['startMoment'],
+            'finishedSegments': self.finished_segments,
+            'numberOfSegments': self.number_of_segments,
+            'finished': self.finished,
+            'passed': passed,
+            'flows': flows,
+        }
+
+    def _add_segment(self, start_moment: datetime, report_url: str) -> None:
+        """Store the results of a finished segment in the checkpoint."""
+        with open(report_url, 'r', encoding='utf-8') as report_file:
+            content: Dict[str, Any] = json.load(report_file)
+        self._checkpoint['segments'].append(
+            {
+                'startMoment': start_moment.isoformat(),
+                'endMoment': datetime.utcnow().isoformat(),
+                'report': report_url,
+                'flows': {
+                    flow['name']: _summarize_flow(flow)
+                    for flow in content.get('flows') or []
+                },
+            }
+        )
+        self._save()
+
+    def _save(self) -> None:
+        """Write the checkpoint file (atomically)."""
+        temporary_path = self._checkpoint_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint:
+            json.dump(self._checkpoint, checkpoint)
+        replace(temporary_path, self._checkpoint_path)
+
+
+def _summarize_flow(flow: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the compact results of a flow in a JSON report."""
+    summary: Dict[str, Any] = {
+        'passed': (flow.get('status') or {}).get('passed'),
+        'txPackets': None,
+        'rxPackets': None,
+        'mos': None,
+        'maximumLatency': None,
+    }
+    for analyser in flow.get('analysers') or []:
+        results = analyser.get('results') or {}
+        sent = results.get('source', {}).get('sent', {})
+        destination = results.get('destination', {})
+        received = destination.get('received', {})
+        if summary['txPackets'] is None and 'packets' in sent:
+            summary['txPackets'] = sent['packets']
+            summary['rxPackets'] = received.get('packets')
+        summary['mos'] = _minimum(
+            summary['mos'],
+            destination.get('voice', {}).get('mos'),
+        )
+        summary['maximumLatency'] = _maximum(
+            summary['maximumLatency'],
+            destination.get('latency', {}).get('maximum'),
+        )
+    return summary
+
+
+def _minimum(*values: Optional[float]) -> Optional[float]:
+    present: List[float] = [value for value in values if value is not None]
+    return min(present) if present else None
+
+
+def _maximum(*values: Optional[float]) -> Optional[float]:
+    present: List[float] = [value for value in values if value is not None]
+    return max(present) if present else None
@@ -0,0 +1,185 @@
+"""Voice soak test using the ByteBlower Test Framework API.
+
+The soak test runs in segments. The results of each finished segment are
+stored in a checkpoint file. When the test is interrupted, run the script
+again: it continues with the next segment.
+"""
+import json
+import logging  # Use the Python default logging interface
+import sys
+from argparse import ArgumentParser
+from datetime import timedelta
+from os import getcwd, makedirs
+from os.path import join
+from typing import Optional, Sequence  # for type hinting
+
+from byteblower_test_framework.analysis import VoiceAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    IPv4Port,
+    NatDiscoveryIPv4Port,
+)
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+from byteblower_test_framework.report import \
+    ByteBlowerJsonReport  # Reporting
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import VoiceFlow  # Traffic generation
+
+from soak import SoakTest  # Soak test with checkpointing
+
+# ByteBlower Server connection parameters
+_SERVER = 'byteblower-tutorial-3100.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'trunk-1-5'
+_CPE_INTERFACE = 'trunk-1-4'
+
+# ByteBlower Port Layer 3 addressing parameters
+# Manual IPv4 configuration:
+_WAN_IPv4 = '10.8.128.61'
+_WAN_NETMASK = '255.255.255.0'
+_WAN_GATEWAY = '10.8.128.1'
+
+_CPE_IPv4 = 'dhcp'
+
+# Soak test parameters
+_SOAK_DURATION = timedelta(hours=24)
+_SEGMENT_DURATION = timedelta(minutes=15)
+# Additional time after the flows stopped in a segment,
+# for processing the last (delayed?) incoming packets.
+_SEGMENT_WAIT_TIME = timedelta(seconds=2)
+
+# The generated reports will be stored to the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+# The checkpoint of the soak test is stored with the reports
+_CHECKPOINT_PATH = join(_REPORT_PATH, 'voice-soak-checkpoint.json')
+_SUMMARY_PATH = join(_REPORT_PATH, 'voice-soak-summary.json')
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the main test procedure.
+
+    :return: Exit code: 0 when all flows passed in all finished segments
+    :rtype: int
+    """
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        '--summary-only',
+        action='store_true',
+        help='only summarize the segments which are finished so far',
+    )
+    args = parser.parse_args(argv)
+
+    makedirs(_REPORT_PATH, exist_ok=True)
+
+    # 1. Create or resume the soak test
+    soak_test = SoakTest(_CHECKPOINT_PATH, _SOAK_DURATION, _SEGMENT_DURATION)
+
+    if not args.summary_only and not soak_test.finished:
+        # 2. Connect to the ByteBlower server and create & initialize ports
+
+        # Connect to the ByteBlower Server
+        server = Server(_SERVER)
+        logging.info('Connected to ByteBlower Server %s', server.info)
+
+        # Simulate a host at the WAN-side of the network
+        wan_port = IPv4Port(
+            server,
+            interface=_WAN_INTERFACE,
+            ipv4=_WAN_IPv4,
+            netmask=_WAN_NETMASK,
+            gateway=_WAN_GATEWAY,
+            name='WAN',
+        )
+        logging.info(
+            'Initialized WAN port %r'
+            ' with IP address %r, network %r',
+            wan_port.name,
+            wan_port.ip,
+            wan_port.network,
+        )
+
+        # Simulate a host at the CPE-side of the network
+        cpe_port = NatDiscoveryIPv4Port(
+            server,
+            interface=_CPE_INTERFACE,
+            ipv4=_CPE_IPv4,
+            name='CPE',
+        )
+        logging.info(
+            'Initialized CPE port %r'
+            ' with IP address %r, network %r',
+            cpe_port.name,
+            cpe_port.ip,
+            cpe_port.network,
+        )
+
+        def run_segment(index: int, duration: timedelta) -> str:
+            # 3. Create a new Scenario for this segment
+            scenario = Scenario()
+
+            # Generate a JSON summary report for each segment.
+            # NOTE: The summary of the segment is stored in the checkpoint.
+            #       The report keeps the complete results of the segment.
+            segment_report = ByteBlowerJsonReport(
+                output_dir=_REPORT_PATH,
+                filename_prefix=f'voice-soak_{index + 1:04d}',
+            )
+            scenario.add_report(segment_report)
+
+            # 4. Define the traffic test (traffic pattern flows)
+            #    The flows have the same name in each segment,
+            #    so their results can be combined in the summary.
+            for source, destination, name in (
+                (wan_port, cpe_port, 'Downstream Voice flow'),
+                (cpe_port, wan_port, 'Upstream Voice flow'),
+            ):
+                # Create a Voice Stream (G.711)
+                voice_flow = VoiceFlow(
+                    source,
+                    destination,
+                    name=name,
+                    duration=duration,
+                    enable_latency=True,
+                )
+                # Analyze frame loss and latency over time and calculate MOS
+                voice_flow.add_analyser(VoiceAnalyser())
+                scenario.add_flow(voice_flow)
+
+            # 5. Run the traffic test and generate the segment report
+            try:
+                scenario.run(maximum_run_time=duration + _SEGMENT_WAIT_TIME)
+                scenario.report()
+            finally:
+                # Release the flows (and their analysers)
+                # before starting the next segment.
+                scenario.release()
+            return segment_report.report_url
+
+        soak_test.run(run_segment)
+
+    # 6. Generate the summary of the (finished) segments
+
+    logging.info('Generating soak test summary')
+    summary = soak_test.summary()
+    with open(_SUMMARY_PATH, 'w', encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    logging.info(
+        'Soak test summary of %d of %d segment(s) stored in %r',
+        summary['finishedSegments'],
+        summary['numberOfSegments'],
+        _SUMMARY_PATH,
+    )
+    return 0 if summary['passed'] else 1
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    sys.exit(main())
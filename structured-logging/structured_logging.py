@@ -0,0 +1,218 @@
+"""Structured, queue-backed logging for tests with many flows."""
+import atexit
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from time import monotonic
+from typing import IO, Any, Dict, List, Optional, Tuple  # for type hinting
+
+# Default number of messages logged for each message template
+# in every rate limit interval.
+_DEFAULT_BURST = 10
+# Default duration of the rate limit interval (in seconds)
+_DEFAULT_INTERVAL = 60.0
+
+# Attributes of every LogRecord. All other attributes are
+# structured fields, given with the ``extra`` argument of the logger.
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord('', logging.NOTSET, '', 0, '', None, None))
+) | {'message', 'asctime'}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format log records as JSON lines.
+
+    Each line has the timestamp, level, logger name and message of the
+    record. The structured fields, given with the ``extra`` argument of
+    the logger, are added as they are.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        created = datetime.fromtimestamp(record.created, timezone.utc)
+        content: Dict[str, Any] = {
+            'timestamp': created.isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                content[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            content['exception'] = record.exc_text
+        return json.dumps(content, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Limit the number of records logged for each message template.
+
+    Repeated messages use the same template with other arguments,
+    for example ``'Created flow %s'`` for every flow. Only the first
+    ``burst`` records of each template are logged in every interval.
+    The first record logged in the next interval has a ``suppressed``
+    field with the number of dropped records. The drop counts which are
+    still pending at the end are available with :meth:`pending_records`.
+
+    A template is identified by the logger name, the level and the
+    (unformatted) message. All records with the same template share the
+    same budget, whatever their arguments are. Use a separate template
+    for messages which must be rate limited separately, for example
+    ``'Created downstream flow %s'`` and ``'Created upstream flow %s'``.
+
+    Warnings and errors are always logged.
+    """
+
+    def __init__(
+        self,
+        burst: int = _DEFAULT_BURST,
+        interval: float = _DEFAULT_INTERVAL,
+    ) -> None:
+        """Create a rate limit filter.
+
+        :param burst: Number of records logged for each message template
+           in every interval, defaults to 10
+        :type burst: int, optional
+        :param interval: Duration of the interval (in seconds),
+           defaults to 60 seconds
+        :type interval: float, optional
+        """
+        super().__init__()
+        self._burst = burst
+        self._interval = interval
+        # Start of the interval, number of logged and dropped records
+        # for each message template.
+        self._templates: Dict[Tuple[str, int, str], List[Any]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = monotonic()
+        state = self._templates.get(key)
+        if state is None or now - state[0] >= self._interval:
+            if state is not None and state[2]:
+                record.suppressed = state[2]
+            self._templates[key] = [now, 1, 0]
+            return True
+        if state[1] < self._burst:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+    def pending_records(self) -> List[logging.LogRecord]:
+        """Return a summary record for each template with dropped records.
+
+        The summary records have a ``suppressed`` field with the number of
+        dropped records and a ``template`` field with the message template.
+        The drop counts are reset.
+
+        :return: Summary records of the dropped records
+        :rtype: List[logging.LogRecord]
+        """
+        records: List[logging.LogRecord] = []
+        for (name, levelno, template), state in self._templates.items():
+            if not state[2]:
+                continue
+            record = logging.LogRecord(
+                name,
+                levelno,
+                __file__,
+                0,
+                'Suppressed %d record(s) of %r',
+                (state[2], template),
+                None,
+            )
+            record.suppressed = state[2]
+            record.template = template
+            records.append(record)
+            state[2] = 0
+        return records
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler which leaves the formatting to the listener.
+
+    The default :class:`QueueHandler` formats the message before it is
+    queued. Here, the message (and the ``repr`` of its arguments) is
+    only formatted in the thread of the :class:`QueueListener`.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # NOTE: The traceback can not be formatted later.
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+
+def configure_structured_logging(
+    stream: Optional[IO[str]] = None,
+    filename: Optional[str] = None,
+    level: int = logging.INFO,
+    burst: Optional[int] = _DEFAULT_BURST,
+    interval: float = _DEFAULT_INTERVAL,
+) -> None:
+    """Log JSON lines from a background thread.
+
+    Use this instead of :func:`logging.basicConfig`, together with
+    :func:`~byteblower_test_framework.logging.configure_logging`.
+
+    The log records are queued by the root logger and are formatted and
+    written by a :class:`QueueListener` thread. Repeated messages are
+    rate limited before they are queued, see :class:`RateLimitFilter`.
+    At exit, the pending drop counts are logged as summary records and
+    the listener is stopped (and the queue flushed).
+
+    :param stream: Write the JSON lines to this stream,
+       defaults to ``None`` (:data:`sys.stderr` when no ``filename``)
+    :type stream: Optional[IO[str]], optional
+    :param filename: Write the JSON lines to this file,
+       defaults to ``None``
+    :type filename: Optional[str], optional
+    :param level: Level of the root logger, defaults to ``logging.INFO``
+    :type level: int, optional
+    :param burst: Number of records logged for each message template in
+       every interval, defaults to 10. ``None`` disables rate limiting.
+    :type burst: Optional[int], optional
+    :param interval: Duration of the rate limit interval (in seconds),
+       defaults to 60 seconds
+    :type interval: float, optional
+    """
+    if filename is not None:
+        handler: logging.Handler = logging.FileHandler(
+            filename, encoding='utf-8'
+        )
+    else:
+        handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JsonLinesFormatter())
+
+    log_queue: SimpleQueue = SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    rate_limit_filter: Optional[RateLimitFilter] = None
+    if burst is not None:
+        rate_limit_filter = RateLimitFilter(burst, interval)
+        queue_handler.addFilter(rate_limit_filter)
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(level)
+
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+
+    def stop() -> None:
+        if rate_limit_filter is not None:
+            # NOTE: Bypass the filter, the summaries must not be dropped.
+            for record in rate_limit_filter.pending_records():
+                queue_handler.enqueue(record)
+        listener.stop()
+
+    atexit.register(stop)
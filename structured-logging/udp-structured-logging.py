@@ -0,0 +1,181 @@
+"""UDP test with many flows, with structured and rate limited logging."""
+import logging  # Use the Python default logging interface
+from datetime import timedelta
+from os import getcwd, makedirs
+from os.path import join
+
+from byteblower_test_framework.analysis import \
+    LatencyFrameLossAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    IPv4Port,
+    NatDiscoveryIPv4Port,
+)
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+from byteblower_test_framework.report import (  # Reporting
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+    ByteBlowerUnitTestReport,
+)
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import (  # Traffic generation
+    FrameBlastingFlow,
+    IPv4Frame,
+)
+
+from structured_logging import \
+    configure_structured_logging  # JSON lines logging
+
+# ByteBlower Server connection parameters
+_SERVER = 'byteblower-tutorial-3100.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'trunk-1-5'
+_CPE_INTERFACE = 'trunk-1-4'
+
+# ByteBlower Port Layer 3 addressing parameters
+# Manual IPv4 configuration:
+_WAN_IPv4 = '10.8.128.61'
+_WAN_NETMASK = '255.255.255.0'
+_WAN_GATEWAY = '10.8.128.1'
+
+_CPE_IPv4 = 'dhcp'
+
+# Traffic parameters (for each flow)
+_NUMBER_OF_FLOWS = 1000  # in each direction
+_UDP_PORT_BASE = 10000
+_FRAME_RATE = 10  # frames per second
+_DURATION = timedelta(seconds=10)
+
+# The generated reports will be stored to the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+# The JSON lines log is stored with the reports
+_LOG_PATH = join(_REPORT_PATH, 'udp-structured-logging.jsonl')
+
+
+def main() -> None:
+    """Run the main test procedure."""
+    # 1. Create a new Scenario
+    scenario = Scenario()
+
+    # Generate a HTML report
+    byteblower_html_report = ByteBlowerHtmlReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_html_report)
+    # Generate a JUnit XML report
+    byteblower_unittest_report = ByteBlowerUnitTestReport(
+        output_dir=_REPORT_PATH
+    )
+    scenario.add_report(byteblower_unittest_report)
+    # Generate a JSON summary report
+    byteblower_summary_report = ByteBlowerJsonReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_summary_report)
+
+    # 2. Connect to the ByteBlower server and create & initialize ports
+
+    # Connect to the ByteBlower Server
+    server = Server(_SERVER)
+    logging.info(
+        'Connected to ByteBlower Server %s',
+        server.info,
+        extra={'server': _SERVER},
+    )
+
+    # Simulate a host at the WAN-side of the network
+    wan_port = IPv4Port(
+        server,
+        interface=_WAN_INTERFACE,
+        ipv4=_WAN_IPv4,
+        netmask=_WAN_NETMASK,
+        gateway=_WAN_GATEWAY,
+        name='WAN',
+    )
+    logging.info(
+        'Initialized port %r',
+        wan_port.name,
+        extra={
+            'port': wan_port.name,
+            'interface': _WAN_INTERFACE,
+            'ip': str(wan_port.ip),
+        },
+    )
+
+    # Simulate a host at the CPE-side of the network
+    cpe_port = NatDiscoveryIPv4Port(
+        server,
+        interface=_CPE_INTERFACE,
+        ipv4=_CPE_IPv4,
+        name='CPE',
+    )
+    logging.info(
+        'Initialized port %r',
+        cpe_port.name,
+        extra={
+            'port': cpe_port.name,
+            'interface': _CPE_INTERFACE,
+            'ip': str(cpe_port.ip),
+        },
+    )
+
+    # 3. Define the traffic test (traffic pattern flows)
+
+    number_of_frames = int(_FRAME_RATE * _DURATION.total_seconds())
+    for number in range(_NUMBER_OF_FLOWS):
+        udp_port = _UDP_PORT_BASE + number
+        for direction, source, destination, message in (
+            ('Downstream', wan_port, cpe_port, 'Created downstream flow %s'),
+            ('Upstream', cpe_port, wan_port, 'Created upstream flow %s'),
+        ):
+            frame = IPv4Frame(
+                udp_src=udp_port, udp_dest=udp_port, latency_tag=True
+            )
+            flow = FrameBlastingFlow(
+                source,
+                destination,
+                name=f'{direction} UDP flow {number + 1}',
+                frame_rate=_FRAME_RATE,
+                number_of_frames=number_of_frames,
+                frame_list=[frame],
+            )
+
+            # Analyze frame loss and latency over time
+            flow.add_analyser(LatencyFrameLossAnalyser())
+
+            scenario.add_flow(flow)
+            # NOTE: The same message template is used for every flow in
+            #       the same direction, so only the first flows of each
+            #       direction are logged (rate limited).
+            #       The flow is only formatted in the logging thread.
+            logging.info(
+                message,
+                flow,
+                extra={
+                    'flow': flow.name,
+                    'udp_port': udp_port,
+                },
+            )
+
+    # 4. Run the traffic test
+
+    # Run the scenario (for 12 seconds)
+    # The flows will stop after 10s, leaving some additional time for
+    # processing the last (delayed?) incoming packets.
+    logging.info('Start scenario', extra={'flows': 2 * _NUMBER_OF_FLOWS})
+    scenario.run(maximum_run_time=timedelta(seconds=12))
+
+    # 5. Generate test report
+
+    logging.info('Generating report')
+    scenario.report()
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to a JSON lines file
+    makedirs(_REPORT_PATH, exist_ok=True)
+    configure_structured_logging(filename=_LOG_PATH, level=logging.INFO)
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    main()
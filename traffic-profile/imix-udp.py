@@ -0,0 +1,192 @@
+"""UDP frame blasting test with IMIX traffic profiles."""
+import logging  # Use the Python default logging interface
+from datetime import timedelta
+from os import getcwd
+from os.path import join
+from typing import Union  # for type hinting
+
+from byteblower_test_framework.analysis import \
+    LatencyFrameLossAnalyser  # Flow analysis
+from byteblower_test_framework.endpoint import (  # Traffic endpoint interfaces
+    Endpoint,
+    IPv4Port,
+    NatDiscoveryIPv4Port,
+    Port,
+)
+from byteblower_test_framework.host import Server  # Host interfaces
+from byteblower_test_framework.logging import \
+    configure_logging  # Helper function
+from byteblower_test_framework.report import (  # Reporting
+    ByteBlowerHtmlReport,
+    ByteBlowerJsonReport,
+    ByteBlowerUnitTestReport,
+)
+from byteblower_test_framework.run import Scenario  # Scenario
+from byteblower_test_framework.traffic import \
+    FrameBlastingFlow  # Traffic generation
+
+from traffic_profile import (  # Frame size distributions
+    DEFAULT_IMIX,
+    SIMPLE_IMIX,
+    TrafficProfile,
+)
+
+# ByteBlower Server connection parameters
+_SERVER = 'byteblower-tutorial-3100.lab.byteblower.excentis.com.'
+
+# ByteBlower Port parameters
+_WAN_INTERFACE = 'trunk-1-5'
+_CPE_INTERFACE = 'trunk-1-4'
+
+# ByteBlower Port Layer 3 addressing parameters
+# Manual IPv4 configuration:
+_WAN_IPv4 = '10.8.128.61'
+_WAN_NETMASK = '255.255.255.0'
+_WAN_GATEWAY = '10.8.128.1'
+
+_CPE_IPv4 = 'dhcp'
+
+# Traffic parameters
+_DOWNSTREAM_BITRATE = 500e6  # bits per second
+_UPSTREAM_BITRATE = 100e6  # bits per second
+_DURATION = timedelta(seconds=10)
+
+# The generated reports will be stored to the 'reports' subdirectory.
+_REPORT_PATH = join(getcwd(), 'reports')
+
+
+def add_profile_flow(
+    scenario: Scenario,
+    source: Union[Port, Endpoint],
+    destination: Union[Port, Endpoint],
+    name: str,
+    profile: TrafficProfile,
+    bitrate: float,
+) -> None:
+    """Add a single flow sending all frame sizes of the profile.
+
+    The test framework converts the bitrate to the frame rate of the
+    profile, based on its average frame size. The loss and latency are
+    analysed over all frame sizes together.
+    """
+    flow = FrameBlastingFlow(
+        source,
+        destination,
+        name=f'{name} ({profile.name})',
+        bitrate=bitrate,
+        duration=_DURATION,
+        # Enable the "latency tagging" so we can analyze latency
+        imix=profile.imix(latency_tag=True),
+    )
+
+    # Analyze frame loss and latency over time
+    flow.add_analyser(LatencyFrameLossAnalyser())
+
+    scenario.add_flow(flow)
+    logging.info('Created flow %s', flow)
+
+
+def main() -> None:
+    """Run the main test procedure."""
+    # 1. Create a new Scenario
+    scenario = Scenario()
+
+    # Generate a HTML report
+    byteblower_html_report = ByteBlowerHtmlReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_html_report)
+    # Generate a JUnit XML report
+    byteblower_unittest_report = ByteBlowerUnitTestReport(
+        output_dir=_REPORT_PATH
+    )
+    scenario.add_report(byteblower_unittest_report)
+    # Generate a JSON summary report
+    byteblower_summary_report = ByteBlowerJsonReport(output_dir=_REPORT_PATH)
+    scenario.add_report(byteblower_summary_report)
+
+    # 2. Connect to the ByteBlower server and create & initialize ports
+
+    # Connect to the ByteBlower Server
+    server = Server(_SERVER)
+    logging.info('Connected to ByteBlower Server %s', server.info)
+
+    # Simulate a host at the WAN-side of the network
+    # Create and initialize a ByteBlowerPort on the given interface
+    # at the connected ByteBlowerServer
+    wan_port = IPv4Port(
+        server,
+        interface=_WAN_INTERFACE,
+        ipv4=_WAN_IPv4,
+        netmask=_WAN_NETMASK,
+        gateway=_WAN_GATEWAY,
+        name='WAN',
+    )
+    logging.info(
+        'Initialized WAN port %r'
+        ' with IP address %r, network %r',
+        wan_port.name,
+        wan_port.ip,
+        wan_port.network,
+    )
+
+    # Simulate a host at the CPE-side of the network
+    # Create and initialize a ByteBlowerPort on the given interface
+    # at the connected ByteBlowerServer
+    cpe_port = NatDiscoveryIPv4Port(
+        server,
+        interface=_CPE_INTERFACE,
+        ipv4=_CPE_IPv4,
+        name='CPE',
+    )
+    logging.info(
+        'Initialized CPE port %r'
+        ' with IP address %r, network %r',
+        cpe_port.name,
+        cpe_port.ip,
+        cpe_port.network,
+    )
+
+    # 3. Define the traffic test (flows)
+
+    # Downstream UDP flow (frame blasting)
+    # All frame sizes of the default IMIX in a single flow
+    add_profile_flow(
+        scenario,
+        wan_port,
+        cpe_port,
+        'Downstream UDP flow',
+        DEFAULT_IMIX,
+        _DOWNSTREAM_BITRATE,
+    )
+
+    # Upstream UDP flow (frame blasting)
+    # All frame sizes of the simple IMIX in a single flow
+    add_profile_flow(
+        scenario,
+        cpe_port,
+        wan_port,
+        'Upstream UDP flow',
+        SIMPLE_IMIX,
+        _UPSTREAM_BITRATE,
+    )
+
+    # 4. Run the traffic test
+
+    # Run the scenario
+    logging.info('Start scenario')
+    scenario.run()
+
+    # 5. Generate test report
+
+    logging.info('Generating report')
+    scenario.report()
+
+
+if __name__ == '__main__':
+    # Initialize the Python logging for output to console
+    logging.basicConfig(level=logging.INFO)
+
+    # Configures the Python logging so that low-level details
+    # are not shown by default.
+    configure_logging()
+
+    main()
@@ -0,0 +1,100 @@
+"""Frame size distributions for frame blasting traffic."""
+from functools import reduce
+from math import gcd
+from typing import Optional, Sequence  # for type hinting
+
+from byteblower_test_framework.traffic import (
+    DEFAULT_IMIX_FRAME_CONFIG,
+    Imix,
+    ImixFrameConfig,
+)
+
+
+class TrafficProfile(object):
+    """Weighted distribution of frame sizes.
+
+    The frame configuration is normalized once (weights are reduced by
+    their greatest common divisor), which keeps the number of frames
+    per ByteBlower stream as low as possible.
+    """
+
+    __slots__ = (
+        '_name',
+        '_frame_config',
+    )
+
+    def __init__(
+        self, name: str, frame_config: Sequence[ImixFrameConfig]
+    ) -> None:
+        """Create a traffic profile.
+
+        :param name: Name of the traffic profile
+        :type name: str
+        :param frame_config: Frame sizes and their weights. The frame
+           length is the layer 2 (Ethernet) frame length *excluding*
+           Ethernet FCS and *excluding* VLAN tags.
+        :type frame_config: Sequence[ImixFrameConfig]
+        :raises ValueError: When no frame sizes or invalid weights are given
+        """
+        if not frame_config:
+            raise ValueError('Traffic profile needs at least one frame size')
+        if any(config.weight <= 0 for config in frame_config):
+            raise ValueError('Frame size weights must be positive')
+        divisor = reduce(gcd, (config.weight for config in frame_config))
+        self._name = name
+        self._frame_config = tuple(
+            ImixFrameConfig(
+                length=config.length, weight=config.weight // divisor
+            ) for config in frame_config
+        )
+
+    @property
+    def name(self) -> str:
+        """Return the name of the traffic profile."""
+        return self._name
+
+    @property
+    def frame_config(self) -> Sequence[ImixFrameConfig]:
+        """Return the (normalized) frame sizes and their weights."""
+        return self._frame_config
+
+    def imix(
+        self,
+        udp_src: Optional[int] = None,
+        udp_dest: Optional[int] = None,
+        latency_tag: bool = False,
+    ) -> Imix:
+        """Return an Imix definition of this profile.
+
+        :param udp_src: UDP source port, defaults to ``None``
+           (*test framework default*)
+        :type udp_src: Optional[int], optional
+        :param udp_dest: UDP destination port, defaults to ``None``
+           (*test framework default*)
+        :type udp_dest: Optional[int], optional
+        :param latency_tag: Enable latency tag generation in the frames,
+           defaults to ``False``
+        :type latency_tag: bool, optional
+        :return: Imix definition to use in a :class:`FrameBlastingFlow`
+        :rtype: Imix
+        """
+        return Imix(
+            frame_config=self._frame_config,
+            udp_src=udp_src,
+            udp_dest=udp_dest,
+            latency_tag=latency_tag,
+        )
+
+
+#: Default IMIX of the ByteBlower Test Framework
+DEFAULT_IMIX = TrafficProfile('Default IMIX', DEFAULT_IMIX_FRAME_CONFIG)
+
+#: Simple IMIX: 7 x 64, 4 x 594 and 1 x 1518 byte frames (including FCS)
+SIMPLE_IMIX = TrafficProfile(
+    'Simple IMIX',
+    (
+        ImixFrameConfig(length=60, weight=7),
+        ImixFrameConfig(length=590, weight=4),
+        ImixFrameConfig(length=1514, weight=1),
+    ),
+)